@@ -0,0 +1,4 @@
+from .app import app, run
+from . import views, api
+
+__all__ = ['app', 'run']
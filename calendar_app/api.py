@@ -0,0 +1,159 @@
+from flask import request, jsonify, url_for, Response
+from datetime import datetime
+
+from . import freebusy, i18n, ics_export, importer, live, overview, schedule, search, sidebar, timeline
+from .app import app
+from .storage import get_store
+
+
+def page_response(endpoint, items, serialize):
+    offset = request.args.get('offset', 0, type=int)
+    limit = request.args.get('limit', sidebar.PAGE_SIZE, type=int)
+    chunk, next_offset = sidebar.page(items, offset, limit)
+    return jsonify({
+        'items': [serialize(item) for item in chunk],
+        'total': len(items),
+        'next_url': url_for(endpoint, offset=next_offset, limit=limit) if next_offset is not None else None,
+    })
+
+@app.route('/api/tasks')
+def api_tasks():
+    return page_response('api_tasks', get_store().task_index, sidebar.task_json)
+
+@app.route('/api/birthdays')
+def api_birthdays():
+    return page_response('api_birthdays', get_store().birthday_index.upcoming(datetime.now().date()), sidebar.birthday_json)
+
+@app.route('/api/marks')
+def api_marks():
+    return page_response('api_marks', get_store().mark_index, sidebar.mark_json)
+
+@app.route('/api/overview/<int:year>/<int:month>')
+def api_overview(year, month):
+    if not (1 <= month <= 12 and 1 <= year <= 9999):
+        return jsonify({'error': 'unknown month'}), 404
+    return jsonify(overview.month_counts(year, month))
+
+@app.route('/api/freebusy')
+def api_freebusy():
+    try:
+        start, end = freebusy.query_range(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    schedule.load_schedule()
+    return jsonify({
+        'from': start.strftime('%d.%m.%Y %H:%M'),
+        'to': end.strftime('%d.%m.%Y %H:%M'),
+        'busy': freebusy.intervals_json(*freebusy.busy_intervals(start, end)),
+    })
+
+@app.route('/api/free-slots')
+def api_free_slots():
+    duration = request.args.get('duration', 60, type=int)
+    if duration <= 0:
+        return jsonify({'error': 'duration must be a positive number of minutes'}), 400
+    try:
+        start, end = freebusy.query_range(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    schedule.load_schedule()
+    return jsonify({
+        'from': start.strftime('%d.%m.%Y %H:%M'),
+        'to': end.strftime('%d.%m.%Y %H:%M'),
+        'duration': duration,
+        'slots': freebusy.intervals_json(*freebusy.free_slots(start, end, duration)),
+    })
+
+@app.route('/api/events')
+def api_events():
+    try:
+        start, end = freebusy.query_range(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    schedule.load_schedule()
+    return jsonify({'events': [dict(event) for event in timeline.overlapping(start, end)]})
+
+@app.route('/api/events/at')
+def api_events_at():
+    try:
+        moment = freebusy.parse_bound(request.args.get('time'), datetime.now())
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    schedule.load_schedule()
+    return jsonify({'time': moment.strftime('%d.%m.%Y %H:%M'), 'events': [dict(event) for event in timeline.happening_at(moment)]})
+
+@app.route('/api/clashes')
+def api_clashes():
+    try:
+        start, end = freebusy.query_range(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    schedule.load_schedule()
+    return jsonify({'clashes': [[dict(event) for event in group] for group in timeline.clashes(start, end)]})
+
+@app.route('/api/batch', methods=['POST'])
+def api_batch():
+    payload = request.get_json(silent=True)
+    operations = payload.get('operations') if isinstance(payload, dict) else None
+    if not isinstance(operations, list):
+        return jsonify({'error': 'expected {"operations": [...]}'}), 400
+
+    try:
+        results = get_store().apply_batch(operations)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify({'applied': len(results), 'results': results})
+
+@app.route('/api/import', methods=['POST'])
+def api_import():
+    upload = request.files.get('file')
+    if upload is None:
+        return jsonify({'error': 'expected a "file" upload'}), 400
+
+    fmt = request.form.get('format') or upload.filename.rsplit('.', 1)[-1].lower()
+    if fmt not in ('csv', 'ics'):
+        return jsonify({'error': 'format must be csv or ics'}), 400
+
+    job = importer.start_import(upload, fmt)
+    return jsonify({**job, 'status_url': url_for('api_import_status', job_id=job['id'])}), 202
+
+@app.route('/api/import/<job_id>')
+def api_import_status(job_id):
+    job = importer.jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'unknown import'}), 404
+    return jsonify(job)
+
+@app.route('/calendar.ics')
+def calendar_ics():
+    etag, body = ics_export.export_calendar(get_store())
+    response = Response(body, mimetype='text/calendar')
+    response.set_etag(etag)
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+@app.route('/search')
+def search_view():
+    query = request.args.get('q', '')
+    limit = max(1, min(request.args.get('limit', search.MAX_RESULTS, type=int), search.MAX_RESULTS))
+    results = []
+    for kind, doc in search.search(query, limit):
+        if kind == 'task':
+            results.append({'type': kind, **sidebar.task_json(doc)})
+        elif kind == 'mark':
+            results.append({'type': kind, **sidebar.mark_json(doc)})
+        else:
+            results.append({'type': kind, **doc})
+    return jsonify({'query': query, 'results': results})
+
+@app.route('/api/stream')
+def api_stream():
+    response = Response(live.stream(i18n.get_locale(), request.args.get('client')), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
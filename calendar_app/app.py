@@ -0,0 +1,101 @@
+from flask import Flask, request, send_from_directory, abort
+from jinja2 import FileSystemBytecodeCache
+from threading import Thread
+from functools import lru_cache
+import hashlib
+import gzip
+import zlib
+import os
+import time
+
+from . import i18n
+
+
+app = Flask(__name__)
+app.secret_key = 'your_code'
+
+TEMPLATE_NAME = 'index.html'
+ASSET_FILES = ('app.css', 'app.js')
+ASSET_MAX_AGE = 365 * 24 * 3600
+
+COMPRESS_MIN_SIZE = 1024
+COMPRESS_LEVEL = 6
+COMPRESS_MIMETYPES = {'text/html', 'text/css', 'text/javascript', 'application/javascript', 'application/json', 'text/calendar'}
+
+# Without a directory Jinja keeps the cache in a private per-user temp dir.
+app.jinja_options = {**app.jinja_options, 'bytecode_cache': FileSystemBytecodeCache()}
+
+assets = {}
+asset_sources = {}
+
+def fingerprint_assets():
+    for filename in ASSET_FILES:
+        with open(os.path.join(app.static_folder, filename), 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        stem, kind = filename.rsplit('.', 1)
+        name = f'{stem}.{digest[:12]}.{kind}'
+        assets[kind] = name
+        asset_sources[name] = filename
+
+fingerprint_assets()
+
+@app.route('/assets/<filename>')
+def asset(filename):
+    if filename not in asset_sources:
+        abort(404)
+    response = send_from_directory(app.static_folder, asset_sources[filename], max_age=ASSET_MAX_AGE)
+    response.cache_control.immutable = True
+    response.direct_passthrough = False
+    return response
+
+@app.context_processor
+def inject_globals():
+    locale = i18n.get_locale()
+    return {
+        'assets': assets,
+        'locale': locale,
+        'locales': i18n.LOCALES,
+        't': i18n.messages(locale),
+    }
+
+@lru_cache(maxsize=64)
+def compress_body(data, encoding):
+    if encoding == 'gzip':
+        return gzip.compress(data, compresslevel=COMPRESS_LEVEL, mtime=0)
+    return zlib.compress(data, COMPRESS_LEVEL)
+
+@app.after_request
+def compress_response(response):
+    if (response.status_code != 200 or response.direct_passthrough
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESS_MIMETYPES):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = request.accept_encodings.best_match(['gzip', 'deflate'])
+    data = response.get_data()
+    if encoding is None or len(data) < COMPRESS_MIN_SIZE:
+        return response
+
+    response.set_data(compress_body(data, encoding))
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+def run(locale=i18n.DEFAULT_LOCALE, schedule_url=None, sources=(), port=5000, timezone=None):
+    from . import notifications, schedule, zones
+
+    i18n.default_locale = locale
+    zones.configure(timezone)
+    schedule.configure(schedule_url, sources)
+    schedule.load_schedule_snapshot()
+
+    Thread(target=notifications.check_upcoming_events, daemon=True).start()
+
+    def open_browser():
+        import webbrowser
+        time.sleep(1.5)
+        webbrowser.open(f'http://localhost:{port}')
+
+    Thread(target=open_browser, daemon=True).start()
+
+    app.run(debug=True, port=port, use_reloader=False)
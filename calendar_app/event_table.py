@@ -0,0 +1,160 @@
+from collections.abc import Mapping
+
+from . import zones
+
+
+MASTER_FIELDS = ('summary', 'description', 'location', 'is_recurring', 'all_day', 'uid')
+EVENT_FIELDS = ('start', 'end', 'start_ts', 'end_ts', 'tz') + MASTER_FIELDS
+
+class MasterEvent:
+    """The attributes shared by every occurrence of one VEVENT."""
+
+    __slots__ = MASTER_FIELDS
+
+    def __init__(self, summary, description, location, is_recurring, all_day, uid):
+        self.summary = summary
+        self.description = description
+        self.location = location
+        self.is_recurring = is_recurring
+        self.all_day = all_day
+        self.uid = uid
+
+class Occurrence(Mapping):
+    """One occurrence: its own start and end, everything else read from its master.
+
+    Reads like the event dicts the app used to pass around, by key or by
+    attribute, so templates and plugins need not know the difference.
+    """
+
+    __slots__ = ('start_ts', 'end_ts', 'master', 'clash')
+
+    def __init__(self, start_ts, end_ts, master):
+        self.start_ts = start_ts
+        self.end_ts = end_ts
+        self.master = master
+        self.clash = False
+
+    def __getitem__(self, key):
+        if key == 'start':
+            return zones.display_text(self.start_ts, self.master.all_day)
+        if key == 'end':
+            return zones.display_text(self.end_ts, self.master.all_day)
+        if key in ('start_ts', 'end_ts'):
+            return getattr(self, key)
+        if key == 'tz':
+            return zones.zone_name()
+        if key in MASTER_FIELDS:
+            return getattr(self.master, key)
+        raise KeyError(key)
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __iter__(self):
+        return iter(EVENT_FIELDS)
+
+    def __len__(self):
+        return len(EVENT_FIELDS)
+
+class EventTable:
+    """Occurrences as parallel arrays sorted by start, with their text stored once.
+
+    strings holds each distinct summary, description, location and UID once.
+    masters rows are (summary, description, location) string ids, the
+    is_recurring and all_day flags and the series UID string id, and an occurrence is only its start and
+    end epoch seconds, its display-zone day ordinal and its master id.
+    """
+
+    def __init__(self, strings=(), masters=(), start_ts=(), end_ts=(), day=(), master=()):
+        import numpy as np
+
+        self.strings = list(strings)
+        self.masters = [tuple(row) for row in masters]
+        start_ts = np.asarray(start_ts, dtype=np.int64)
+        order = np.argsort(start_ts, kind='stable')
+        self.start_ts = start_ts[order]
+        self.end_ts = np.asarray(end_ts, dtype=np.int64)[order]
+        self.day = np.asarray(day, dtype=np.int32)[order]
+        self.master = np.asarray(master, dtype=np.int32)[order]
+        self.all_day = np.array([row[4] for row in self.masters], dtype=bool)[self.master]
+        self.records = [MasterEvent(self.strings[summary], self.strings[description], self.strings[location],
+                                    is_recurring, all_day, self.strings[uid])
+                        for summary, description, location, is_recurring, all_day, uid in self.masters]
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Build from (start_ts, end_ts, master) rows.
+
+        master is a (summary, description, location, is_recurring, all_day, uid)
+        tuple, shared by all the rows of one series.
+        """
+        strings, string_ids = [], {}
+        masters, masters_by_key, master_ids = [], {}, {}
+        start_ts, end_ts, day, master = [], [], [], []
+
+        def intern(text):
+            if text not in string_ids:
+                string_ids[text] = len(strings)
+                strings.append(text)
+            return string_ids[text]
+
+        for start, end, record in rows:
+            if record not in master_ids:
+                summary, description, location, is_recurring, all_day, uid = record
+                key = (intern(summary), intern(description), intern(location), bool(is_recurring), bool(all_day),
+                       intern(uid))
+                if key not in masters_by_key:
+                    masters_by_key[key] = len(masters)
+                    masters.append(key)
+                master_ids[record] = masters_by_key[key]
+            start_ts.append(start)
+            end_ts.append(end)
+            day.append(zones.local_ordinal(start))
+            master.append(master_ids[record])
+        return cls(strings, masters, start_ts, end_ts, day, master)
+
+    @classmethod
+    def from_events(cls, events):
+        return cls.from_rows((event['start_ts'], event['end_ts'], tuple(event[field] for field in MASTER_FIELDS))
+                             for event in events)
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(data['strings'], data['masters'], data['start_ts'], data['end_ts'], data['day'], data['master'])
+
+    def to_json(self):
+        return {
+            'strings': self.strings,
+            'masters': self.masters,
+            'start_ts': self.start_ts.tolist(),
+            'end_ts': self.end_ts.tolist(),
+            'day': self.day.tolist(),
+            'master': self.master.tolist(),
+        }
+
+    def between(self, start, end):
+        """Positions of the occurrences starting in [start, end) epoch seconds."""
+        import numpy as np
+
+        lo, hi = np.searchsorted(self.start_ts, (start, end))
+        return range(lo, hi)
+
+    def series_positions(self, uids):
+        """Positions of the occurrences of the series with the given UIDs."""
+        import numpy as np
+
+        ids = [i for i, record in enumerate(self.records) if record.uid in uids]
+        return np.flatnonzero(np.isin(self.master, ids))
+
+    def __len__(self):
+        return len(self.start_ts)
+
+    def __getitem__(self, i):
+        return Occurrence(int(self.start_ts[i]), int(self.end_ts[i]), self.records[self.master[i]])
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
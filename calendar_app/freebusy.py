@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta
+from threading import Lock
+
+from . import schedule, timeline, zones
+
+
+DEFAULT_RANGE = timedelta(days=7)
+
+lock = Lock()
+busy = {}
+
+def merge(starts, ends):
+    """Merge intervals sorted by start that overlap or touch, in one sweep."""
+    import numpy as np
+
+    if not len(starts):
+        return starts, ends
+    ends = np.maximum.accumulate(ends)
+    # A new busy block begins wherever a start is past every end before it.
+    opens = np.ones(len(starts), dtype=bool)
+    opens[1:] = starts[1:] > ends[:-1]
+    closes = np.append(opens[1:], True)
+    return starts[opens], ends[closes]
+
+def invalidate(events, changes):
+    with lock:
+        busy.clear()
+
+schedule.subscribe(invalidate)
+
+def busy_intervals(start, end):
+    """Merged busy (starts, ends) arrays clipped to [start, end)."""
+    import numpy as np
+
+    with lock:
+        if not busy:
+            index, events = timeline.event_index()
+            busy['starts'], busy['ends'] = merge(index.starts, index.ends)
+        starts, ends = busy['starts'], busy['ends']
+
+    start, end = zones.local_epoch(start), zones.local_epoch(end)
+    lo = np.searchsorted(ends, start, side='right')
+    hi = np.searchsorted(starts, end, side='left')
+    return np.maximum(starts[lo:hi], start), np.minimum(ends[lo:hi], end)
+
+def free_slots(start, end, duration):
+    """Gaps of at least duration between busy blocks in [start, end)."""
+    import numpy as np
+
+    busy_starts, busy_ends = busy_intervals(start, end)
+    gap_starts = np.concatenate(([zones.local_epoch(start)], busy_ends))
+    gap_ends = np.concatenate((busy_starts, [zones.local_epoch(end)]))
+    keep = gap_ends - gap_starts >= duration * 60
+    return gap_starts[keep], gap_ends[keep]
+
+def intervals_json(starts, ends):
+    return [{'start': zones.display_text(start), 'end': zones.display_text(end)}
+            for start, end in zip(starts.tolist(), ends.tolist())]
+
+def parse_bound(value, default):
+    """DD.MM.YYYY or DD.MM.YYYY HH:MM; raises ValueError for anything else."""
+    if not value:
+        return default
+    for fmt in ('%d.%m.%Y %H:%M', '%d.%m.%Y'):
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            pass
+    raise ValueError(f"expected DD.MM.YYYY[ HH:MM], got {value!r}")
+
+def query_range(args):
+    start = parse_bound(args.get('from'), datetime.now().replace(second=0, microsecond=0))
+    end = parse_bound(args.get('to'), start + DEFAULT_RANGE)
+    if end <= start:
+        raise ValueError("'to' must be after 'from'")
+    return start, end
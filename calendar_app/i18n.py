@@ -0,0 +1,126 @@
+from flask import session
+
+
+LOCALES = ('en', 'ru')
+DEFAULT_LOCALE = 'en'
+
+DAY_NAMES = {
+    'en': ('Mn', 'Tu', 'We', 'Th', 'Fr', 'Sat', 'Sun'),
+    'ru': ('Пн', 'Вт', 'Ср', 'Чт', 'Пт', 'Сб', 'Вс'),
+}
+
+MONTH_NAMES = {
+    'en': ('January', 'February', 'March', 'April', 'May', 'June',
+           'July', 'August', 'September', 'October', 'November', 'December'),
+    'ru': ('Январь', 'Февраль', 'Март', 'Апрель', 'Май', 'Июнь',
+           'Июль', 'Август', 'Сентябрь', 'Октябрь', 'Ноябрь', 'Декабрь'),
+}
+
+CATALOGS = {
+    'en': {
+        'title': 'Calendar with tasks',
+        'reload_schedule': 'Reload schedule',
+        'prev_week': 'Last week',
+        'this_week': 'This week',
+        'next_week': 'Next week',
+        'month_view': 'Month',
+        'year_view': 'Year',
+        'back_to_week': 'Back to week',
+        'weeks_after': 'After {n} week(s)',
+        'weeks_before': '{n} week(s) before',
+        'notifications': 'Notifications',
+        'clear_notifications': 'Clean notifications',
+        'tasks': 'Tasks',
+        'task_description': 'Task description',
+        'date_placeholder': 'DD.MM.YYYY',
+        'day_placeholder': 'DD.MM',
+        'today': 'Today',
+        'add_task': 'Add task',
+        'confirm_delete_task': 'Delete task?',
+        'no_tasks': 'No tasks',
+        'birthdays': 'Birthdays',
+        'name': 'Name',
+        'add': 'Add',
+        'confirm_delete_birthday': 'Do you want to delete birthday?',
+        'no_birthdays': 'No birthdays',
+        'marks': 'Tags',
+        'mark_text': 'Tags text',
+        'confirm_delete_mark': 'Delete tag?',
+        'no_marks': 'No tags',
+        'week_schedule': 'Week schedule',
+        'today_marker': 'TODAY',
+        'untitled': 'without name',
+        'recurring_event': 'Repeating event',
+        'clash': 'Clashes with another event',
+        'birthday': 'birthday',
+        'no_events': 'No events',
+        'events': 'Events',
+        'deadlines': 'Deadlines',
+        'error_date_format': 'Wrong data format. Use DD.MM.YYYY',
+        'error_day_format': 'Wrong data format. Use DD.MM',
+        'notify_task': 'Task "{description}" must be completed in {days} d.',
+        'notify_event': 'Tomorrow will be: {summary}',
+        'notify_birthday_today': 'Today {name} celebrates birthday!',
+        'notify_birthday': '{name} will celebrate birthday in {days} d.',
+    },
+    'ru': {
+        'title': 'Календарь с задачами',
+        'reload_schedule': 'Обновить расписание',
+        'prev_week': 'Предыдущая неделя',
+        'this_week': 'Текущая неделя',
+        'next_week': 'Следующая неделя',
+        'month_view': 'Месяц',
+        'year_view': 'Год',
+        'back_to_week': 'К неделе',
+        'weeks_after': 'Через {n} недель(и)',
+        'weeks_before': '{n} недель(и) назад',
+        'notifications': 'Уведомления',
+        'clear_notifications': 'Очистить уведомления',
+        'tasks': 'Задачи',
+        'task_description': 'Описание задачи',
+        'date_placeholder': 'ДД.ММ.ГГГГ',
+        'day_placeholder': 'ДД.ММ',
+        'today': 'Сегодня',
+        'add_task': 'Добавить задачу',
+        'confirm_delete_task': 'Удалить задачу?',
+        'no_tasks': 'Нет задач',
+        'birthdays': 'Дни рождения',
+        'name': 'Имя',
+        'add': 'Добавить',
+        'confirm_delete_birthday': 'Удалить день рождения?',
+        'no_birthdays': 'Нет дней рождения',
+        'marks': 'Метки',
+        'mark_text': 'Текст метки',
+        'confirm_delete_mark': 'Удалить метку?',
+        'no_marks': 'Нет меток',
+        'week_schedule': 'Расписание на неделю',
+        'today_marker': 'СЕГОДНЯ',
+        'untitled': 'Без названия',
+        'recurring_event': 'Повторяющееся событие',
+        'clash': 'Пересекается с другим событием',
+        'birthday': 'день рождения',
+        'no_events': 'Нет событий',
+        'events': 'События',
+        'deadlines': 'Дедлайны',
+        'error_date_format': 'Неверный формат даты. Используйте ДД.ММ.ГГГГ',
+        'error_day_format': 'Неверный формат даты. Используйте ДД.ММ',
+        'notify_task': 'Задача "{description}" должна быть выполнена через {days} дн.',
+        'notify_event': 'Завтра событие: {summary}',
+        'notify_birthday_today': 'Сегодня день рождения у {name}!',
+        'notify_birthday': 'Через {days} дн. день рождения у {name}',
+    },
+}
+
+default_locale = DEFAULT_LOCALE
+
+def get_locale():
+    locale = session.get('locale')
+    if locale in CATALOGS:
+        return locale
+    return default_locale
+
+def messages(locale=None):
+    return CATALOGS[locale or get_locale()]
+
+def format_message(locale, key, params):
+    return CATALOGS[locale][key].format(**params)
@@ -0,0 +1,114 @@
+from datetime import datetime, timedelta
+
+
+PRODID = '-//calendar_app//EN'
+# Fixed so unchanged components stay byte-identical between versions.
+DTSTAMP = '20000101T000000Z'
+
+component_cache = {}
+export_cache = {'etag': None, 'body': None}
+
+def escape(text):
+    return (text.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+            .replace('\r\n', '\\n').replace('\n', '\\n'))
+
+def fold(line):
+    """Split a content line into 75-octet pieces as RFC 5545 requires."""
+    data = line.encode('utf-8')
+    if len(data) <= 75:
+        return line + '\r\n'
+    parts = []
+    while data:
+        limit = 75 if not parts else 74
+        # Never cut inside a multi-byte UTF-8 sequence.
+        while limit < len(data) and (data[limit] & 0xC0) == 0x80:
+            limit -= 1
+        parts.append(data[:limit].decode('utf-8'))
+        data = data[limit:]
+    return '\r\n '.join(parts) + '\r\n'
+
+def ics_date(value, fmt):
+    return datetime.strptime(value, fmt).strftime('%Y%m%d')
+
+def component(key, lines):
+    cached = component_cache.get(key)
+    if cached is None:
+        cached = component_cache[key] = ''.join(fold(line) for line in lines())
+    return cached
+
+def task_component(task):
+    key = ('task', task['id'], task['description'], task['deadline'], task.get('completed', False))
+    return component(key, lambda: [
+        'BEGIN:VTODO',
+        f"UID:task-{task['id']}@calendar_app",
+        f'DTSTAMP:{DTSTAMP}',
+        f"SUMMARY:{escape(task['description'])}",
+        f"DUE;VALUE=DATE:{ics_date(task['deadline'], '%d.%m.%Y')}",
+        'STATUS:COMPLETED' if task.get('completed', False) else 'STATUS:NEEDS-ACTION',
+        'END:VTODO',
+    ])
+
+def birthday_component(birthday):
+    # 2000 is a leap year, so 29.02 birthdays are representable.
+    start = datetime.strptime(birthday['date'] + '.2000', '%d.%m.%Y')
+    # A plain yearly rule skips non-leap years; like the app, fall back to 28.02.
+    rule = 'RRULE:FREQ=YEARLY;BYMONTH=2;BYMONTHDAY=-1' if (start.month, start.day) == (2, 29) else 'RRULE:FREQ=YEARLY'
+    return component(('birthday', birthday['id'], birthday['date'], birthday['name']), lambda: [
+        'BEGIN:VEVENT',
+        f"UID:birthday-{birthday['id']}@calendar_app",
+        f'DTSTAMP:{DTSTAMP}',
+        f"SUMMARY:{escape(birthday['name'])}",
+        f"DTSTART;VALUE=DATE:{start.strftime('%Y%m%d')}",
+        f"DTEND;VALUE=DATE:{(start + timedelta(days=1)).strftime('%Y%m%d')}",
+        rule,
+        'END:VEVENT',
+    ])
+
+def mark_component(mark):
+    start = datetime.strptime(mark['date'], '%d.%m.%Y')
+    return component(('mark', mark['id'], mark['date'], mark['text']), lambda: [
+        'BEGIN:VEVENT',
+        f"UID:mark-{mark['id']}@calendar_app",
+        f'DTSTAMP:{DTSTAMP}',
+        f"SUMMARY:{escape(mark['text'])}",
+        f"DTSTART;VALUE=DATE:{start.strftime('%Y%m%d')}",
+        f"DTEND;VALUE=DATE:{(start + timedelta(days=1)).strftime('%Y%m%d')}",
+        'END:VEVENT',
+    ])
+
+def export_calendar(store):
+    """ICS body for the store, rebuilt only when the store version changes.
+
+    Components are memoised by their content, so a rebuild after one edit
+    reuses the text of every other entry.
+    """
+    with store.lock:
+        etag = store.etag()
+        if export_cache['etag'] == etag:
+            return etag, export_cache['body']
+
+        chunks = ['BEGIN:VCALENDAR\r\n', 'VERSION:2.0\r\n', f'PRODID:{PRODID}\r\n', 'CALSCALE:GREGORIAN\r\n']
+        for task in store.task_index:
+            try:
+                chunks.append(task_component(task))
+            except ValueError:
+                pass
+        for birthday in store.birthdays.values():
+            try:
+                chunks.append(birthday_component(birthday))
+            except ValueError:
+                pass
+        for mark in store.marks.values():
+            try:
+                chunks.append(mark_component(mark))
+            except ValueError:
+                pass
+        chunks.append('END:VCALENDAR\r\n')
+
+        live = set(chunks)
+        for key in [key for key, text in component_cache.items() if text not in live]:
+            del component_cache[key]
+
+        export_cache['etag'] = etag
+        export_cache['body'] = ''.join(chunks).encode('utf-8')
+        return etag, export_cache['body']
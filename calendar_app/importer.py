@@ -0,0 +1,155 @@
+from datetime import date
+from threading import Thread, Lock
+import csv
+import os
+import tempfile
+import uuid
+
+from .storage import get_store
+
+
+MAX_JOBS = 20
+
+jobs = {}
+jobs_lock = Lock()
+
+def parse_date(value):
+    """Normalise DD.MM.YYYY, YYYY-MM-DD or iCalendar YYYYMMDD[Thhmmss[Z]] to DD.MM.YYYY.
+
+    Slices and int() instead of strptime: imports parse one date per row.
+    """
+    value = (value or '').strip()
+    try:
+        if len(value) == 10 and value[2] == '.' and value[5] == '.':
+            day, month, year = int(value[:2]), int(value[3:5]), int(value[6:])
+        elif len(value) == 10 and value[4] == '-' and value[7] == '-':
+            year, month, day = int(value[:4]), int(value[5:7]), int(value[8:])
+        elif len(value) >= 8 and value[:8].isdigit():
+            year, month, day = int(value[:4]), int(value[4:6]), int(value[6:8])
+        else:
+            return None
+        date(year, month, day)
+    except ValueError:
+        return None
+    return f'{day:02d}.{month:02d}.{year:04d}'
+
+def read_lines(f, job):
+    for raw in f:
+        job['bytes_read'] += len(raw)
+        yield raw.decode('utf-8-sig', errors='replace')
+
+def csv_records(lines):
+    """Rows with a header of kind, date/deadline, text/description and completed."""
+    for row in csv.DictReader(lines):
+        row = {(key or '').strip().lower(): (value or '').strip() for key, value in row.items()}
+        kind = row.get('kind') or row.get('type') or 'task'
+        yield {
+            'kind': 'mark' if kind.lower() in ('mark', 'tag') else 'task',
+            'date': row.get('date') or row.get('deadline'),
+            'text': row.get('text') or row.get('description'),
+            'completed': row.get('completed', '').lower() in ('1', 'true', 'yes', 'x'),
+        }
+
+def ics_lines(lines):
+    """Unfold RFC 5545 continuation lines without holding the file in memory."""
+    current = None
+    for line in lines:
+        line = line.rstrip('\r\n')
+        if line[:1] in (' ', '\t') and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield current
+        current = line
+    if current is not None:
+        yield current
+
+def ics_records(lines):
+    """VTODO components become tasks, VEVENT components become marks."""
+    component = None
+    for line in ics_lines(lines):
+        name, _, value = line.partition(':')
+        name = name.split(';', 1)[0].upper()
+        if name == 'BEGIN' and value.upper() in ('VTODO', 'VEVENT'):
+            component = {'type': value.upper()}
+        elif component is None:
+            continue
+        elif name == 'END' and value.upper() == component['type']:
+            if component['type'] == 'VTODO':
+                yield {
+                    'kind': 'task',
+                    'date': component.get('DUE') or component.get('DTSTART'),
+                    'text': component.get('SUMMARY'),
+                    'completed': component.get('STATUS', '').upper() == 'COMPLETED',
+                }
+            else:
+                yield {'kind': 'mark', 'date': component.get('DTSTART'), 'text': component.get('SUMMARY')}
+            component = None
+        elif name in ('SUMMARY', 'DUE', 'DTSTART', 'STATUS'):
+            component[name] = value.replace('\\,', ',').replace('\\;', ';').replace('\\n', ' ').strip()
+
+def run_import(job, path, fmt):
+    try:
+        store = get_store()
+        with store.lock:
+            seen_tasks = {(t['description'], t['deadline']) for t in store.tasks.values()}
+            seen_marks = {(m['date'], m['text']) for m in store.marks.values()}
+
+        operations = []
+        with open(path, 'rb') as f:
+            lines = read_lines(f, job)
+            records = ics_records(lines) if fmt == 'ics' else csv_records(lines)
+            for record in records:
+                job['rows'] += 1
+                day = parse_date(record['date'])
+                text = record['text']
+                if not day or not text:
+                    job['invalid'] += 1
+                    continue
+
+                if record['kind'] == 'task':
+                    key, seen = (text, day), seen_tasks
+                    operation = {'op': 'add', 'collection': 'tasks', 'description': text, 'deadline': day,
+                                 'completed': record['completed']}
+                else:
+                    key, seen = (day, text), seen_marks
+                    operation = {'op': 'add', 'collection': 'marks', 'date': day, 'text': text}
+                if key in seen:
+                    job['duplicates'] += 1
+                    continue
+                seen.add(key)
+                operations.append(operation)
+
+        store.apply_batch(operations)
+        job['added'] = len(operations)
+        job['state'] = 'done'
+    except Exception as e:
+        job['state'] = 'failed'
+        job['error'] = str(e)
+    finally:
+        os.remove(path)
+
+def start_import(upload, fmt):
+    fd, path = tempfile.mkstemp(suffix=f'.{fmt}')
+    with os.fdopen(fd, 'wb') as f:
+        upload.save(f)
+
+    job = {
+        'id': uuid.uuid4().hex,
+        'format': fmt,
+        'state': 'running',
+        'total_bytes': os.path.getsize(path),
+        'bytes_read': 0,
+        'rows': 0,
+        'added': 0,
+        'duplicates': 0,
+        'invalid': 0,
+        'error': None,
+    }
+    with jobs_lock:
+        jobs[job['id']] = job
+        while len(jobs) > MAX_JOBS:
+            del jobs[next(iter(jobs))]
+
+    Thread(target=run_import, args=(job, path, fmt), daemon=True).start()
+    return job
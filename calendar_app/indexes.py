@@ -0,0 +1,246 @@
+from datetime import datetime, date
+from bisect import bisect_left, bisect_right
+
+
+# Tasks with an unparsable deadline sort after every valid date.
+BAD_DEADLINE = date.max.toordinal() + 1
+
+def deadline_ordinal(deadline):
+    try:
+        return datetime.strptime(deadline, '%d.%m.%Y').toordinal()
+    except (TypeError, ValueError):
+        return BAD_DEADLINE
+
+class TaskIndex:
+    """Tasks ordered incomplete-first, then by deadline and id.
+
+    Keys are kept in a sorted list next to the tasks, so reading the first k
+    tasks is a slice and add/remove are a bisect plus one list shift.
+    """
+
+    def __init__(self, tasks=()):
+        entries = sorted(((self.key(task), task) for task in tasks), key=lambda entry: entry[0])
+        self.keys = [key for key, task in entries]
+        self.tasks = [task for key, task in entries]
+
+    @staticmethod
+    def key(task):
+        return (bool(task.get('completed', False)), deadline_ordinal(task.get('deadline')), task['id'])
+
+    def add(self, task):
+        key = self.key(task)
+        i = bisect_left(self.keys, key)
+        self.keys.insert(i, key)
+        self.tasks.insert(i, task)
+
+    def remove(self, task, key=None):
+        key = key or self.key(task)
+        i = bisect_left(self.keys, key)
+        while i < len(self.keys) and self.keys[i] == key:
+            if self.tasks[i] is task:
+                del self.keys[i]
+                del self.tasks[i]
+                return
+            i += 1
+
+    def position(self, task):
+        """Where task sits in iteration order."""
+        return bisect_left(self.keys, self.key(task))
+
+    def incomplete(self):
+        """Incomplete tasks with their deadline ordinals, earliest first."""
+        for (completed, ordinal, task_id), task in zip(self.keys, self.tasks):
+            if completed:
+                break
+            yield ordinal, task
+
+    def __len__(self):
+        return len(self.tasks)
+
+    def __getitem__(self, i):
+        return self.tasks[i]
+
+    def __iter__(self):
+        return iter(self.tasks)
+
+class MarkIndex:
+    """Marks in the order they were added, which is id order.
+
+    Ids only grow, so an add is an append and a remove is a bisect.
+    """
+
+    def __init__(self, marks=()):
+        self.marks = sorted(marks, key=lambda mark: mark['id'])
+        self.ids = [mark['id'] for mark in self.marks]
+
+    def add(self, mark):
+        i = bisect_right(self.ids, mark['id'])
+        self.ids.insert(i, mark['id'])
+        self.marks.insert(i, mark)
+
+    def remove(self, mark):
+        i = bisect_left(self.ids, mark['id'])
+        if i < len(self.ids) and self.ids[i] == mark['id']:
+            del self.ids[i]
+            del self.marks[i]
+
+    def __len__(self):
+        return len(self.marks)
+
+    def __getitem__(self, i):
+        return self.marks[i]
+
+    def __iter__(self):
+        return iter(self.marks)
+
+# Birthdays are placed on the days of a leap year so 29.02 has its own slot.
+LEAP_YEAR = 2000
+
+def day_slot(day_key):
+    return datetime.strptime(f'{day_key}.{LEAP_YEAR}', '%d.%m.%Y').timetuple().tm_yday
+
+def is_leap(year):
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+class RotatedView:
+    """Read-only sequence of items[start:] + items[:start] without copying."""
+
+    def __init__(self, items, start):
+        self.items = items
+        self.start = start
+
+    def __len__(self):
+        return len(self.items)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self.items)))]
+        return self.items[(self.start + i) % len(self.items)]
+
+class BirthdayIndex:
+    """Birthdays sorted by day of year, answering date-range queries by bisect.
+
+    In non-leap years birthdays on 29.02 are reported on 28.02.
+    """
+
+    def __init__(self, birthdays=()):
+        self.slots = []
+        self.items = []
+        for birthday in birthdays:
+            self.add(birthday)
+
+    def add(self, birthday):
+        try:
+            slot = day_slot(birthday['date'])
+        except ValueError:
+            return
+        i = bisect_right(self.slots, slot)
+        self.slots.insert(i, slot)
+        self.items.insert(i, birthday)
+
+    def remove(self, birthday):
+        try:
+            slot = day_slot(birthday['date'])
+        except ValueError:
+            return
+        for i in range(bisect_left(self.slots, slot), bisect_right(self.slots, slot)):
+            if self.items[i] is birthday:
+                del self.slots[i]
+                del self.items[i]
+                return
+
+    def slot_range(self, start, end):
+        """Items whose slot falls in the same-year window [start, end]."""
+        first = date(LEAP_YEAR, start.month, start.day).timetuple().tm_yday
+        last = date(LEAP_YEAR, end.month, end.day).timetuple().tm_yday
+        if not is_leap(end.year) and (end.month, end.day) == (2, 28):
+            last += 1
+        return self.items[bisect_left(self.slots, first):bisect_right(self.slots, last)]
+
+    def between(self, start, end):
+        """(date, item) pairs for every birthday in [start, end], in date order.
+
+        Windows crossing the year end are split into one bisect per year.
+        """
+        result = []
+        year = start.year
+        while year <= end.year:
+            segment_start = start if year == start.year else date(year, 1, 1)
+            segment_end = end if year == end.year else date(year, 12, 31)
+            for item in self.slot_range(segment_start, segment_end):
+                day, month = map(int, item['date'].split('.'))
+                if (month, day) == (2, 29) and not is_leap(year):
+                    day = 28
+                result.append((date(year, month, day), item))
+            year += 1
+        return result
+
+    def upcoming(self, today):
+        """All birthdays ordered from today onwards, wrapping past 31.12."""
+        slot = date(LEAP_YEAR, today.month, today.day).timetuple().tm_yday
+        return RotatedView(self.items, bisect_left(self.slots, slot))
+
+    def position(self, birthday, today):
+        """Where birthday sits in upcoming(today)."""
+        view = self.upcoming(today)
+        i = bisect_left(self.slots, day_slot(birthday['date']))
+        while self.items[i] is not birthday:
+            i += 1
+        return (i - view.start) % len(view)
+
+    def __len__(self):
+        return len(self.items)
+
+class IntervalIndex:
+    """Half-open [start, end) intervals as NumPy arrays sorted by start.
+
+    Nothing can overlap [a, b) if it starts more than the longest interval's
+    length before a, so a query is two searchsorted calls and a filter over
+    the intervals starting in that window.
+    """
+
+    def __init__(self, starts, ends, ids):
+        import numpy as np
+
+        order = np.argsort(starts, kind='stable')
+        self.starts, self.ends, self.ids = starts[order], ends[order], ids[order]
+        self.longest = (self.ends - self.starts).max() if len(order) else 0
+
+    def window(self, start, end, side='left'):
+        """Sorted positions of the intervals ending after start and starting before end."""
+        import numpy as np
+
+        lo = np.searchsorted(self.starts, start - self.longest, side='right')
+        hi = np.searchsorted(self.starts, end, side=side)
+        return lo + np.flatnonzero(self.ends[lo:hi] > start)
+
+    def overlapping(self, start, end):
+        """Ids of intervals overlapping [start, end), by start."""
+        return self.ids[self.window(start, end)]
+
+    def at(self, moment):
+        """Ids of intervals with start <= moment < end."""
+        return self.ids[self.window(moment, moment, side='right')]
+
+    def groups(self):
+        """Group number of each interval (in start order) for chains of overlaps."""
+        import numpy as np
+
+        if not len(self.starts):
+            return np.array([], dtype=np.int64)
+        reach = np.maximum.accumulate(self.ends)
+        opens = np.ones(len(self.starts), dtype=bool)
+        opens[1:] = self.starts[1:] >= reach[:-1]
+        return np.cumsum(opens) - 1
+
+    def clashing(self):
+        """Ids of intervals that overlap at least one other interval.
+
+        A chain of overlaps is a connected component of the overlap graph, so
+        every interval in a group of two or more clashes with something.
+        """
+        import numpy as np
+
+        groups = self.groups()
+        sizes = np.bincount(groups)
+        return self.ids[sizes[groups] > 1]
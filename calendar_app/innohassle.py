@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta
+
+from . import zones
+
+
+def project(events):
+    all_events = []
+
+    start_of_week = 0
+    end_of_week = 0
+
+
+    for event in events:
+        event_date_str = event.get('start')
+        if not event_date_str:
+            continue
+        try:
+            event_date = datetime.strptime(event_date_str, '%d.%m.%Y %H:%M')
+        except ValueError:
+            continue
+        start_of_week = event_date - timedelta(days=0, hours=23, minutes=59, seconds=59, microseconds=999999)
+        end_of_week = start_of_week + timedelta(days=7, hours=23, minutes=59, seconds=59, microseconds=999999)
+        break
+    
+    for event in events:
+        event_date_str = event.get('start')
+        if not event_date_str:
+            continue
+        try:
+            event_date = datetime.strptime(event_date_str, '%d.%m.%Y %H:%M')
+        except ValueError:
+            continue
+        if start_of_week <= event_date <= end_of_week:
+            all_events.append(event)
+        now = datetime.now()
+        weekday = now.weekday()
+        start_of_week_new = now - timedelta(days=weekday)
+        start_of_week_new = start_of_week_new.replace(hour=0, minute=0, second=0, microsecond=0)
+        end_of_week_new = start_of_week_new + timedelta(days=6, hours=23, minutes=59, seconds=59, microseconds=999999)
+        if start_of_week_new <= event_date <= end_of_week_new:
+            all_events.append(event)
+
+    for event in all_events:
+        new_event = event.copy()
+
+        event_date_start_str = event.get('start')
+        if not event_date_start_str:
+            continue
+        try:
+            event_date_start = datetime.strptime(event_date_start_str, '%d.%m.%Y %H:%M')
+        except ValueError:
+            continue
+
+        event_date_end_str = event.get('end')
+        if not event_date_end_str:
+            continue
+        try:
+            event_date_end = datetime.strptime(event_date_end_str, '%d.%m.%Y %H:%M')
+        except ValueError:
+            continue
+
+        for week in range(1, 54):
+            new_date_start = event_date_start + timedelta(weeks=week)
+            new_date_start_str = new_date_start.strftime('%d.%m.%Y %H:%M')
+            new_event['start'] = new_date_start_str
+
+        
+            new_date_end = event_date_end + timedelta(weeks=week)
+            new_date_str = new_date_end.strftime('%d.%m.%Y %H:%M')
+            new_event['end'] = new_date_str
+            if 'start_ts' in event:
+                # Shift by wall clock like start and end, so weeks across a DST change keep their hour.
+                new_event['start_ts'] = zones.local_epoch(new_date_start)
+                new_event['end_ts'] = zones.local_epoch(new_date_end)
+
+            now = datetime.now()
+            weekday = now.weekday()
+            start_of_week = now - timedelta(days=weekday)
+            start_of_week = start_of_week.replace(hour=0, minute=0, second=0, microsecond=0)
+            end_of_week = start_of_week + timedelta(days=6, hours=23, minutes=59, seconds=59, microseconds=999999)
+
+            end_of_week += timedelta(weeks=1)
+
+        
+            if start_of_week <= new_date_end <= end_of_week:
+                events.append(new_event.copy())
+
+    return events
@@ -0,0 +1,93 @@
+from datetime import date
+from queue import Queue, Empty, Full
+from threading import Lock
+import json
+
+from flask import has_request_context, request
+
+from . import i18n, schedule, storage
+
+
+HEARTBEAT = 25
+RETRY_MS = 5000
+MAX_PENDING = 64
+
+lock = Lock()
+clients = []
+
+def request_client():
+    """Id of the tab that sent the current request, if it sent one."""
+    return request.headers.get('X-Client-Id') if has_request_context() else None
+
+def broadcast(kind, data, source=None):
+    """Queue a change message for every open stream but source's, the tab that made the change."""
+    with lock:
+        for queue in clients:
+            try:
+                queue.put_nowait((kind, data, source))
+            except Full:
+                # A tab this far behind reloads instead of replaying what it missed.
+                with queue.mutex:
+                    queue.queue.clear()
+                queue.put_nowait(('reload', {}, None))
+
+def week_starts(days):
+    """'DD.MM.YYYY' Mondays of the weeks containing the given day ordinals."""
+    mondays = {day - date.fromordinal(day).weekday() for day in days}
+    return [date.fromordinal(monday).strftime('%d.%m.%Y') for monday in sorted(mondays)]
+
+def on_schedule_change(events, changes):
+    if changes['full']:
+        broadcast('schedule', {'full': True})
+    elif changes['days']:
+        broadcast('schedule', {'full': False, 'weeks': week_starts(changes['days'])})
+
+def on_store_change(action, collection, record):
+    if action == 'reload':
+        broadcast('store', {'action': 'reload'})
+        return
+    if action == 'batch':
+        # One message however many records a batch or import touched.
+        broadcast('store', {'action': 'batch', 'collections': sorted({change[1] for change in record})})
+        return
+    message = {'action': action, 'collection': collection, 'id': record['id']}
+    if collection != 'tasks':
+        # Lets a tab tell whether the record shows in the week it displays.
+        message['date'] = record['date']
+    # Record changes come from a route, and the tab that sent it has patched its page already.
+    # Reloads and batches go to every tab, the one whose request happened to trigger them included.
+    broadcast('store', message, request_client())
+
+schedule.subscribe(on_schedule_change)
+storage.subscribe(on_store_change)
+
+def event_text(kind, data):
+    return f'event: {kind}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n'
+
+def stream(locale, client=None):
+    """Server-sent events for one tab, with notification messages in its locale.
+
+    Changes the tab made itself are skipped; it patched the page from their responses.
+    """
+    queue = Queue(MAX_PENDING)
+    with lock:
+        clients.append(queue)
+    try:
+        yield f'retry: {RETRY_MS}\n\n'
+        while True:
+            try:
+                kind, data, source = queue.get(timeout=HEARTBEAT)
+            except Empty:
+                # Comments keep proxies from closing an idle connection.
+                yield ': ping\n\n'
+                continue
+            if client and source == client:
+                continue
+            if kind == 'notifications' and 'added' in data:
+                data = {'added': [{**notification,
+                                   'message': i18n.format_message(locale, notification['key'], notification['params'])}
+                                  for notification in data['added']]}
+            yield event_text(kind, data)
+    finally:
+        with lock:
+            clients.remove(queue)
@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta
+import time
+
+from . import i18n, live, zones
+from .schedule import load_schedule
+from .storage import get_store
+
+
+notifications = []
+
+def check_upcoming_events():
+    global notifications
+    while True:
+        try:
+            store = get_store()
+            events = load_schedule()
+            today = datetime.now().date()
+            new_notifications = []
+
+            # The index is in deadline order, so stop at the first task due too late.
+            for ordinal, task in store.task_index.incomplete():
+                days_until = ordinal - today.toordinal()
+                if days_until > 3:
+                    break
+                if days_until >= 0:
+                    new_notifications.append({
+                        'type': 'task',
+                        'key': 'notify_task',
+                        'params': {'description': task['description'], 'days': days_until},
+                        'date': task['deadline']
+                    })
+
+            tomorrow = today + timedelta(days=1)
+            tomorrow_start = zones.local_epoch(datetime.combine(tomorrow, datetime.min.time()))
+            tomorrow_end = zones.local_epoch(datetime.combine(tomorrow + timedelta(days=1), datetime.min.time()))
+            for position in events.between(tomorrow_start, tomorrow_end):
+                event = events[position]
+                new_notifications.append({
+                    'type': 'event',
+                    'key': 'notify_event',
+                    'params': {'summary': event['summary']},
+                    'date': event['start'][:10]
+                })
+
+            for check_date, birthday in store.birthday_index.between(today, today + timedelta(days=6)):
+                days_until = (check_date - today).days
+                new_notifications.append({
+                    'type': 'birthday',
+                    'key': 'notify_birthday_today' if days_until == 0 else 'notify_birthday',
+                    'params': {'name': birthday['name'], 'days': days_until},
+                    'date': check_date.strftime('%d.%m.%Y')
+                })
+
+            added = [notification for notification in new_notifications if notification not in notifications]
+            notifications = new_notifications
+            if added:
+                live.broadcast('notifications', {'added': added})
+        except Exception as e:
+            print(f"Error of checking notifications: {e}")
+
+        time.sleep(3600)
+
+def localized_notifications(locale):
+    return [
+        {**notification, 'message': i18n.format_message(locale, notification['key'], notification['params'])}
+        for notification in notifications
+    ]
+
+def clear(source=None):
+    global notifications
+    notifications = []
+    live.broadcast('notifications', {'cleared': True}, source)
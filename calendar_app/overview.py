@@ -0,0 +1,86 @@
+from datetime import date, timedelta
+from threading import RLock
+import calendar
+
+from . import schedule, storage
+
+
+KINDS = ('events', 'deadlines', 'birthdays', 'marks')
+
+lock = RLock()
+day_arrays = {}
+month_cache = {}
+
+def day_ordinal(text):
+    """Ordinal of a 'DD.MM.YYYY[ HH:MM]' string, or None if it is not a date."""
+    try:
+        return date(int(text[6:10]), int(text[3:5]), int(text[:2])).toordinal()
+    except (TypeError, ValueError):
+        return None
+
+def sorted_days(values):
+    import numpy as np
+
+    days = np.fromiter((d for d in map(day_ordinal, values) if d is not None), dtype=np.int64)
+    days.sort()
+    return days
+
+def arrays(store):
+    """Sorted ordinal-day arrays, built once per schedule and store change."""
+    import numpy as np
+
+    if not day_arrays:
+        day_arrays['events'] = np.sort(schedule.current_events().day.astype(np.int64))
+        day_arrays['deadlines'] = sorted_days(task['deadline'] for task in store.tasks.values()
+                                              if not task.get('completed', False))
+        day_arrays['marks'] = sorted_days(mark['date'] for mark in store.marks.values())
+    return day_arrays
+
+def invalidate(*args):
+    with lock:
+        day_arrays.clear()
+        month_cache.clear()
+
+def on_schedule_change(events, changes):
+    """Drop only the months whose days gained or lost an occurrence."""
+    if changes['full']:
+        invalidate()
+        return
+    months = {(day.year, day.month) for day in map(date.fromordinal, changes['days'])}
+    with lock:
+        day_arrays.clear()
+        for month in months:
+            month_cache.pop(month, None)
+
+schedule.subscribe(on_schedule_change)
+storage.subscribe(invalidate)
+
+def count_days(days, first, n):
+    import numpy as np
+
+    lo, hi = np.searchsorted(days, (first, first + n))
+    return np.bincount(days[lo:hi] - first, minlength=n)
+
+def compute_month(store, year, month):
+    import numpy as np
+
+    weekday, n = calendar.monthrange(year, month)
+    first = date(year, month, 1)
+    birthday_days = np.array([day.toordinal() for day, birthday
+                              in store.birthday_index.between(first, first + timedelta(days=n - 1))], dtype=np.int64)
+
+    days = dict(arrays(store), birthdays=birthday_days)
+    counts = {'year': year, 'month': month, 'weekday': weekday, 'days': n}
+    for kind in KINDS:
+        counts[kind] = count_days(days[kind], first.toordinal(), n).tolist()
+    return counts
+
+def month_counts(year, month):
+    """Per-day counts for one month as columns: counts[kind][day - 1]."""
+    # Fetch the store first: a reload from disk invalidates the cache.
+    store = storage.get_store()
+    with lock:
+        counts = month_cache.get((year, month))
+        if counts is None:
+            counts = month_cache[(year, month)] = compute_month(store, year, month)
+        return counts
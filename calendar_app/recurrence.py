@@ -0,0 +1,167 @@
+from datetime import datetime, time, timedelta
+import hashlib
+
+from . import zones
+
+
+SIMPLE_PARTS = ('FREQ', 'INTERVAL', 'UNTIL', 'BYDAY', 'WKST')
+WEEKDAYS = {'MO': 0, 'TU': 1, 'WE': 2, 'TH': 3, 'FR': 4, 'SA': 5, 'SU': 6}
+
+def parse_until(value):
+    """Floating UNTIL (YYYYMMDD or YYYYMMDDThhmmss); None for UTC or anything else."""
+    try:
+        if len(value) == 8:
+            return datetime(int(value[:4]), int(value[4:6]), int(value[6:8]))
+        if len(value) == 15 and value[8] == 'T':
+            return datetime(int(value[:4]), int(value[4:6]), int(value[6:8]),
+                            int(value[9:11]), int(value[11:13]), int(value[13:15]))
+    except ValueError:
+        pass
+    return None
+
+def parse_simple_weekly(rule_text):
+    """(interval, until, weekdays) of a plain FREQ=WEEKLY rule, or None."""
+    parts = {}
+    for part in rule_text.strip().split(';'):
+        name, sep, value = part.partition('=')
+        name = name.upper()
+        if not sep or name not in SIMPLE_PARTS or name in parts:
+            return None
+        parts[name] = value.upper()
+
+    # dateutil counts weeks from Monday unless WKST says otherwise.
+    if parts.get('FREQ') != 'WEEKLY' or parts.get('WKST', 'MO') != 'MO':
+        return None
+    interval = parts.get('INTERVAL', '1')
+    if not interval.isdigit() or int(interval) < 1:
+        return None
+
+    until = None
+    if 'UNTIL' in parts:
+        until = parse_until(parts['UNTIL'])
+        if until is None:
+            return None
+
+    weekdays = None
+    if 'BYDAY' in parts:
+        try:
+            weekdays = sorted({WEEKDAYS[day] for day in parts['BYDAY'].split(',')})
+        except KeyError:
+            return None
+    return int(interval), until, weekdays
+
+def weekly_occurrences(rule_text, dtstart, after, before):
+    """Starts of a simple weekly rule strictly between after and before.
+
+    Matches dateutil's rrulestr(rule_text, dtstart=dtstart).between(after, before)
+    as a datetime64[s] array, or returns None when the rule or dtstart is not
+    one this covers and dateutil has to expand it.
+    """
+    import numpy as np
+
+    if getattr(dtstart, 'tzinfo', None) is not None:
+        return None
+    rule = parse_simple_weekly(rule_text)
+    if rule is None:
+        return None
+    interval, until, weekdays = rule
+
+    if not isinstance(dtstart, datetime):
+        dtstart = datetime.combine(dtstart, time())
+    dtstart = dtstart.replace(microsecond=0)
+    if weekdays is None:
+        weekdays = [dtstart.weekday()]
+
+    # Week k starts on the Monday k weeks after dtstart's, at dtstart's time of day.
+    monday = dtstart - timedelta(days=dtstart.weekday())
+    upper = before if until is None else min(before, until)
+    first_week = max((after - monday).days // 7, 0)
+    first_week -= first_week % interval
+    last_week = (upper - monday).days // 7
+    if last_week < first_week:
+        return np.array([], dtype='datetime64[s]')
+
+    weeks = np.arange(first_week, last_week + 1, interval) * 7
+    starts = (np.datetime64(monday, 's')
+              + np.timedelta64(1, 'D') * (weeks[:, None] + np.array(weekdays)[None, :])).ravel()
+    keep = (starts >= np.datetime64(dtstart, 's')) & (starts > np.datetime64(after)) & (starts < np.datetime64(before))
+    if until is not None:
+        keep &= starts <= np.datetime64(until, 's')
+    return starts[keep]
+
+def expand(rule_text, dtstart, after, before):
+    """Epoch seconds of each occurrence start strictly between after and before.
+
+    after and before are naive display-zone datetimes. Occurrences follow the
+    wall clock of DTSTART's own zone, so a 09:00 lecture stays at 09:00 across
+    a DST change.
+    """
+    tz = zones.zone_of(dtstart)
+    wall_after = zones.wall_time(zones.local_epoch(after), tz)
+    wall_before = zones.wall_time(zones.local_epoch(before), tz)
+    wall_start = dtstart.replace(tzinfo=None) if isinstance(dtstart, datetime) else dtstart
+
+    occurrences = weekly_occurrences(rule_text, wall_start, wall_after, wall_before)
+    if occurrences is not None:
+        return zones.wall_epochs(occurrences, tz).tolist()
+
+    from dateutil import rrule
+
+    if getattr(dtstart, 'tzinfo', None) is not None:
+        after, before = wall_after.replace(tzinfo=tz), wall_before.replace(tzinfo=tz)
+    rule = rrule.rrulestr(rule_text, dtstart=dtstart)
+    return [zones.epoch(occ) for occ in rule.between(after, before)]
+
+NO_OVERRIDES = {'excluded': frozenset(), 'added': ()}
+
+def content_hash(component):
+    """Hash of a component's text, ignoring DTSTAMP, which feeds rewrite on every export."""
+    lines = [line for line in component.to_ical().splitlines() if not line.startswith(b'DTSTAMP')]
+    return hashlib.sha1(b'\n'.join(lines)).hexdigest()
+
+def series_key(component):
+    uid = component.get('uid')
+    return str(uid) if uid is not None else 'content:' + content_hash(component)
+
+def is_override(component):
+    return component.get('recurrence-id') is not None
+
+def group_series(calendar):
+    """VEVENTs grouped by series: the master and its RECURRENCE-ID overrides share a key."""
+    series = {}
+    for component in calendar.walk('VEVENT'):
+        series.setdefault(series_key(component), []).append(component)
+    return series
+
+def revision(component):
+    recurrence_id = component.get('recurrence-id')
+    recurrence_id = recurrence_id.to_ical().decode('utf-8') if recurrence_id is not None else ''
+    modified = component.get('last-modified')
+    if modified is None:
+        return (recurrence_id, '', content_hash(component))
+    return (recurrence_id, str(component.get('sequence', 0)), modified.to_ical().decode('utf-8'))
+
+def fingerprint(components):
+    """Revision of a series: SEQUENCE and LAST-MODIFIED of each component.
+
+    A component without LAST-MODIFIED is identified by its content instead,
+    so a feed that never sets it is still diffed correctly, only slower.
+    """
+    return tuple(sorted(revision(component) for component in components))
+
+def collect_overrides(components, tzids):
+    """Per-UID map of the starts to drop and to add when expanding a series.
+
+    excluded holds EXDATEs plus the original start of every instance that a
+    RECURRENCE-ID component replaces (or cancels); added holds RDATEs. Both
+    are epoch seconds, so expansion checks each occurrence with one set lookup.
+    """
+    overrides = {}
+    for component in components:
+        entry = overrides.setdefault(series_key(component), {'excluded': set(), 'added': []})
+        if is_override(component):
+            entry['excluded'].add(zones.epoch(zones.component_time(component, 'recurrence-id', tzids)))
+        else:
+            entry['excluded'].update(zones.component_times(component, 'exdate', tzids))
+            entry['added'].extend(zones.component_times(component, 'rdate', tzids))
+    return overrides
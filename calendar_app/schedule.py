@@ -0,0 +1,240 @@
+from datetime import datetime, time, timedelta
+from threading import Lock, Thread
+import importlib
+import json
+import os
+
+from . import recurrence, zones
+from .event_table import EventTable
+
+
+SCHEDULE_CACHE_FILE = 'schedule_cache.json'
+SCHEDULE_TTL = 3600
+SNAPSHOT_VERSION = 4
+SOURCE_PLUGINS = ('innohassle',)
+
+schedule_url = 'your_url'
+source_plugins = []
+# None until a snapshot or download provides one, so importing the app skips numpy.
+cached_events = None
+last_cache_update = None
+schedule_lock = Lock()
+listeners = []
+# Rows expanded per series on the last download, reused while the series is unchanged.
+series_cache = {}
+series_window = None
+FULL_CHANGE = {'full': True, 'added': (), 'changed': (), 'removed': (), 'days': ()}
+last_changes = FULL_CHANGE
+
+def configure(url=None, sources=()):
+    global schedule_url
+    if url:
+        schedule_url = url
+    for name in sources:
+        if name not in SOURCE_PLUGINS:
+            raise ValueError(f"Unknown schedule source: {name}")
+        source_plugins.append(importlib.import_module(f'.{name}', __package__))
+
+def subscribe(listener):
+    """Call listener(events, changes) whenever a new schedule is published.
+
+    changes lists the added, changed and removed series UIDs and the display
+    days their occurrences fell on before and after. When full is set the
+    whole schedule must be treated as new.
+    """
+    listeners.append(listener)
+
+def publish(changes=FULL_CHANGE):
+    for listener in listeners:
+        listener(cached_events, changes)
+
+def invalidate():
+    global cached_events, last_cache_update, series_window
+    cached_events = None
+    last_cache_update = None
+    series_cache.clear()
+    series_window = None
+
+def current_events():
+    """The published table, or an empty one before the first load."""
+    return cached_events if cached_events is not None else EventTable()
+
+def schedule_is_fresh():
+    return last_cache_update is not None and (datetime.now() - last_cache_update).total_seconds() < SCHEDULE_TTL
+
+def load_schedule_snapshot():
+    global cached_events, last_cache_update
+    try:
+        with open(SCHEDULE_CACHE_FILE, 'r') as f:
+            snapshot = json.load(f)
+        # Older snapshots lack epoch times; others were rendered for another zone.
+        if snapshot.get('version') != SNAPSHOT_VERSION or snapshot.get('tz') != zones.zone_name():
+            return
+        cached_events = EventTable.from_json(snapshot['events'])
+        last_cache_update = datetime.fromisoformat(snapshot['updated'])
+    except (FileNotFoundError, ValueError, KeyError):
+        return
+    publish()
+
+def save_schedule_snapshot():
+    tmp_path = f'{SCHEDULE_CACHE_FILE}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump({'version': SNAPSHOT_VERSION, 'tz': zones.zone_name(),
+                   'updated': last_cache_update.isoformat(), 'events': cached_events.to_json()}, f)
+    os.replace(tmp_path, SCHEDULE_CACHE_FILE)
+
+def refresh():
+    """Download, save and publish the schedule; releases schedule_lock, which the caller holds."""
+    try:
+        if cached_events and schedule_is_fresh():
+            return cached_events
+        events = download_schedule()
+        if events is cached_events:
+            save_schedule_snapshot()
+            publish(last_changes)
+        return events
+    finally:
+        schedule_lock.release()
+
+def load_schedule():
+    if cached_events and schedule_is_fresh():
+        return cached_events
+
+    if not cached_events:
+        schedule_lock.acquire()
+        return refresh()
+
+    # With something to show, never make a request wait for the download.
+    if schedule_lock.acquire(blocking=False):
+        Thread(target=refresh, daemon=True).start()
+    return cached_events
+
+def expand_series(components, tzids, start_date, end_date, window_start, window_end):
+    """(start_ts, end_ts, master) rows of one series inside the download window."""
+    rows = []
+    overrides = recurrence.collect_overrides(components, tzids)
+    for component in components:
+        summary = str(component.get('summary', ''))
+        description = str(component.get('description', ''))
+        location = str(component.get('location', ''))
+        uid = recurrence.series_key(component)
+        
+        start_dt = zones.component_time(component, 'dtstart', tzids)
+        end_dt = zones.component_time(component, 'dtend', tzids)
+        all_day = not isinstance(start_dt, datetime)
+        start_ts = zones.epoch(start_dt)
+        end_ts = zones.epoch(end_dt)
+        
+        rrule_data = component.get('rrule')
+        series = overrides.get(uid, recurrence.NO_OVERRIDES)
+        
+        # A series that began before the window can still have occurrences inside it.
+        recurring = not recurrence.is_override(component) and bool(rrule_data or series['added'])
+        if start_ts >= window_end or (end_ts < window_start and not recurring):
+            continue
+        
+        if recurrence.is_override(component):
+            # A moved instance replaces the start its RECURRENCE-ID excluded; a cancelled one just drops it.
+            if str(component.get('status', '')).upper() != 'CANCELLED':
+                rows.append((start_ts, end_ts, (summary, description, location, True, all_day, uid)))
+        elif recurring:
+            try:
+                if rrule_data:
+                    rule_text = rrule_data.to_ical().decode('utf-8')
+                    occurrences = recurrence.expand(rule_text, start_dt, start_date, end_date)
+                else:
+                    occurrences = [start_ts] if start_ts >= window_start else []
+                if series['added']:
+                    generated = set(occurrences)
+                    occurrences += [added for added in series['added']
+                                    if window_start <= added < window_end and added not in generated]
+                
+                # One master tuple per series; occurrences only add their own times.
+                master = (summary, description, location, True, all_day, uid)
+                excluded = series['excluded']
+                for occ_start in occurrences:
+                    if occ_start not in excluded:
+                        rows.append((occ_start, occ_start + end_ts - start_ts, master))
+            except Exception as e:
+                print(f"Error of processing repeating event: {e}")
+                rows.append((start_ts, end_ts, (summary, description, location, False, all_day, uid)))
+        else:
+            rows.append((start_ts, end_ts, (summary, description, location, False, all_day, uid)))
+    return rows
+
+def row_days(rows):
+    return {zones.local_ordinal(start) for start, end, master in rows}
+
+def download_schedule():
+    global cached_events, last_cache_update, series_window, last_changes
+    import hashlib
+    import requests
+    from icalendar import Calendar
+    from dateutil.relativedelta import relativedelta
+
+    events = EventTable()
+    try:
+        url = schedule_url
+        response = requests.get(url, timeout=30)
+        calendar = Calendar.from_ical(response.content)
+        
+        now = datetime.now()
+        start_date = now - relativedelta(months=2)
+        end_date = now + relativedelta(years=1)
+        
+        print(f"Download events from {start_date.strftime('%d.%m.%Y')} по {end_date.strftime('%d.%m.%Y')}")
+        
+        tzids = zones.vtimezones(calendar)
+        window_start = zones.local_epoch(datetime.combine(start_date.date(), time()))
+        window_end = zones.local_epoch(datetime.combine(end_date.date() + timedelta(days=1), time()))
+        
+        # Cached rows only hold for the same window, display zone and VTIMEZONE rules.
+        timezones = hashlib.sha1(b''.join(component.to_ical() for component in calendar.walk('VTIMEZONE')))
+        window = (window_start, window_end, zones.zone_name(), timezones.hexdigest())
+        previous = series_cache if window == series_window else {}
+        
+        current = {}
+        changes = {'full': not previous, 'added': [], 'changed': [], 'removed': [], 'days': set()}
+        for uid, components in recurrence.group_series(calendar).items():
+            fingerprint = recurrence.fingerprint(components)
+            entry = previous.get(uid)
+            if entry is not None and entry['fingerprint'] == fingerprint:
+                current[uid] = entry
+                continue
+            rows = expand_series(components, tzids, start_date, end_date, window_start, window_end)
+            current[uid] = {'fingerprint': fingerprint, 'rows': rows}
+            changes['changed' if entry is not None else 'added'].append(uid)
+            changes['days'] |= row_days(rows)
+            if entry is not None:
+                changes['days'] |= row_days(entry['rows'])
+        for uid in previous.keys() - current.keys():
+            changes['removed'].append(uid)
+            changes['days'] |= row_days(previous[uid]['rows'])
+        print(f"Re-expanded {len(changes['added']) + len(changes['changed'])} of {len(current)} series, "
+              f"{len(changes['removed'])} removed")
+        
+        events = EventTable.from_rows(row for entry in current.values() for row in entry['rows'])
+        if source_plugins:
+            # Plugins rewrite plain event dicts, so round-trip through them.
+            projected = [dict(event) for event in events]
+            for plugin in source_plugins:
+                projected = plugin.project(projected)
+            events = EventTable.from_events(projected)
+            # Their output depends on more than the feed, so nothing downstream can be kept.
+            changes['full'] = True
+
+        print(f"Download {len(events)} events")
+        series_cache.clear()
+        series_cache.update(current)
+        series_window = window
+        changes['days'] = sorted(changes['days'])
+        last_changes = changes
+        cached_events = events
+        last_cache_update = datetime.now()
+        
+    except Exception as e:
+        print(f"Error of download schedule: {e}")
+        import traceback
+        traceback.print_exc()
+        
+    return events
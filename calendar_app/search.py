@@ -0,0 +1,157 @@
+from datetime import datetime
+from bisect import bisect_left, insort
+from threading import RLock
+import re
+
+from . import schedule, storage
+from .indexes import deadline_ordinal
+
+
+TOKEN_RE = re.compile(r'\w+')
+MAX_RESULTS = 200
+
+def tokenize(text):
+    return set(TOKEN_RE.findall((text or '').casefold()))
+
+def event_sort_key(event):
+    try:
+        start = datetime.strptime(event['start'], '%d.%m.%Y %H:%M')
+        return (start.toordinal(), start.hour * 60 + start.minute)
+    except (KeyError, ValueError):
+        return (deadline_ordinal(event.get('start', '')[:10]), 0)
+
+class SearchIndex:
+    """Inverted index from token to the keys of events, tasks and marks.
+
+    Tokens are also kept sorted, so a prefix query is a bisect followed by a
+    scan over the tokens sharing that prefix.
+    """
+
+    def __init__(self):
+        self.lock = RLock()
+        self.postings = {}
+        self.tokens = []
+        self.docs = {}
+
+    def add(self, key, text, sort_key, doc):
+        with self.lock:
+            self.remove(key)
+            tokens = tokenize(text)
+            self.docs[key] = (sort_key, doc, tokens)
+            for token in tokens:
+                posting = self.postings.get(token)
+                if posting is None:
+                    posting = self.postings[token] = set()
+                    insort(self.tokens, token)
+                posting.add(key)
+
+    def remove(self, key):
+        with self.lock:
+            entry = self.docs.pop(key, None)
+            if entry is None:
+                return
+            for token in entry[2]:
+                posting = self.postings[token]
+                posting.discard(key)
+                if not posting:
+                    del self.postings[token]
+                    del self.tokens[bisect_left(self.tokens, token)]
+
+    def remove_kind(self, kind):
+        with self.lock:
+            for key in [key for key in self.docs if key[0] == kind]:
+                self.remove(key)
+
+    def prefix_matches(self, prefix):
+        keys = set()
+        i = bisect_left(self.tokens, prefix)
+        while i < len(self.tokens) and self.tokens[i].startswith(prefix):
+            keys |= self.postings[self.tokens[i]]
+            i += 1
+        return keys
+
+    def search(self, query, limit=MAX_RESULTS):
+        """Keys matching every query word as a prefix, in date order."""
+        words = sorted(tokenize(query), key=len, reverse=True)
+        if not words:
+            return []
+        with self.lock:
+            keys = None
+            for word in words:
+                matches = self.prefix_matches(word)
+                keys = matches if keys is None else keys & matches
+                if not keys:
+                    return []
+            ranked = sorted(keys, key=lambda key: (self.docs[key][0], key))
+            return [(key[0], self.docs[key][1]) for key in ranked[:limit]]
+
+index = SearchIndex()
+built = False
+
+def index_events(events, uids=None):
+    """Index every occurrence, or re-index just those of the series in uids."""
+    with index.lock:
+        if uids is None:
+            index.remove_kind('event')
+            positions = range(len(events))
+        else:
+            for key in [key for key in index.docs if key[0] == 'event' and key[1] in uids]:
+                index.remove(key)
+            positions = events.series_positions(uids)
+        for i in positions:
+            event = events[i]
+            text = ' '.join((event.get('summary', ''), event.get('location', ''), event.get('description', '')))
+            index.add(('event', event['uid'], event['start_ts']), text, event_sort_key(event), event)
+
+def index_record(collection, record):
+    if collection == 'tasks':
+        index.add(('task', record['id']), record['description'],
+                  (deadline_ordinal(record['deadline']), 0), record)
+    elif collection == 'marks':
+        index.add(('mark', record['id']), record['text'], (deadline_ordinal(record['date']), 0), record)
+
+def index_store(store):
+    with index.lock:
+        index.remove_kind('task')
+        index.remove_kind('mark')
+        for task in store.tasks.values():
+            index_record('tasks', task)
+        for mark in store.marks.values():
+            index_record('marks', mark)
+
+def on_store_change(action, collection, record):
+    if not built:
+        return
+    if action == 'reload':
+        index_store(record)
+    elif action == 'batch':
+        for change in record:
+            on_store_change(*change)
+    elif action == 'delete':
+        index.remove((collection[:-1], record['id']))
+    else:
+        index_record(collection, record)
+
+def on_schedule_change(events, changes):
+    if not built:
+        return
+    if changes['full']:
+        index_events(events)
+    else:
+        index_events(events, set(changes['added']) | set(changes['changed']) | set(changes['removed']))
+
+def ensure_built():
+    """Build the index on the first search; listeners keep it current afterwards."""
+    global built
+    with index.lock:
+        if not built:
+            built = True
+            index_store(storage.get_store())
+            index_events(schedule.current_events())
+
+storage.subscribe(on_store_change)
+schedule.subscribe(on_schedule_change)
+
+def search(query, limit=MAX_RESULTS):
+    ensure_built()
+    return index.search(query, limit)
@@ -0,0 +1,27 @@
+from flask import url_for
+
+
+PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+def task_json(task):
+    return {
+        'id': task['id'],
+        'description': task['description'],
+        'deadline': task['deadline'],
+        'completed': task.get('completed', False),
+        'toggle_url': url_for('toggle_task', task_id=task['id']),
+        'delete_url': url_for('delete_task', task_id=task['id']),
+    }
+
+def birthday_json(birthday):
+    return {**birthday, 'delete_url': url_for('delete_birthday', birthday_id=birthday['id'])}
+
+def mark_json(mark):
+    return {**mark, 'delete_url': url_for('delete_mark', mark_id=mark['id'])}
+
+def page(items, offset=0, limit=PAGE_SIZE):
+    offset = max(offset, 0)
+    limit = min(max(limit, 1), MAX_PAGE_SIZE)
+    next_offset = offset + limit if offset + limit < len(items) else None
+    return items[offset:offset + limit], next_offset
@@ -0,0 +1,337 @@
+function formatDateInput(input, format) {
+    let digits = input.value.replace(/[^\d]/g, '');
+
+    if (format === 'dd.mm') {
+        if (digits.length > 2) {
+            digits = digits.substring(0, 2) + '.' + digits.substring(2, 4);
+        }
+        if (digits.length > 5) {
+            digits = digits.substring(0, 5);
+        }
+        input.value = digits;
+    } else {
+        if (digits.length > 2) {
+            digits = digits.substring(0, 2) + '.' + digits.substring(2);
+        }
+        if (digits.length > 5) {
+            digits = digits.substring(0, 5) + '.' + digits.substring(5);
+        }
+        if (digits.length > 10) {
+            digits = digits.substring(0, 10);
+        }
+        input.value = digits;
+    }
+}
+
+document.getElementById('deadline')?.addEventListener('input', function() {
+    formatDateInput(this, 'dd.mm.yyyy');
+});
+
+document.getElementById('mark-date')?.addEventListener('input', function() {
+    formatDateInput(this, 'dd.mm.yyyy');
+});
+
+document.getElementById('birthday-date')?.addEventListener('input', function() {
+    formatDateInput(this, 'dd.mm');
+});
+
+function setToday(fieldId) {
+    const today = new Date();
+    const day = String(today.getDate()).padStart(2, '0');
+    const month = String(today.getMonth() + 1).padStart(2, '0');
+    const year = today.getFullYear();
+    
+    const dateField = document.getElementById(fieldId);
+    if (fieldId === 'birthday-date') {
+        dateField.value = `${day}.${month}`;
+    } else {
+        dateField.value = `${day}.${month}.${year}`;
+    }
+}
+
+document.querySelectorAll('input[type="text"]').forEach(input => {
+    input.addEventListener('focus', function() {
+        this.style.borderColor = 'var(--accent-color)';
+    });
+    
+    input.addEventListener('blur', function() {
+        this.style.borderColor = 'var(--border-color)';
+    });
+});
+
+function sidebarItem(className, text, deleteUrl, confirmText, toggleUrl) {
+    const row = document.createElement('div');
+    row.className = className;
+
+    const label = document.createElement(toggleUrl ? 'a' : 'span');
+    label.textContent = text;
+    if (toggleUrl) {
+        label.className = 'task-toggle';
+        label.href = toggleUrl;
+        label.dataset.mutation = '';
+    }
+
+    const link = document.createElement('a');
+    link.href = deleteUrl;
+    link.dataset.mutation = '';
+    link.addEventListener('click', event => {
+        if (!confirm(confirmText)) {
+            event.preventDefault();
+        }
+    });
+    const button = document.createElement('button');
+    button.className = 'delete-btn';
+    button.textContent = '✕';
+    link.appendChild(button);
+
+    const actions = document.createElement('div');
+    actions.className = 'task-actions';
+    actions.appendChild(link);
+
+    row.append(label, toggleUrl ? actions : link);
+    return row;
+}
+
+const sidebarRenderers = {
+    tasks: (item, confirmText) => sidebarItem(
+        'task' + (item.completed ? ' completed' : ''),
+        `${item.deadline} - ${item.description}`, item.delete_url, confirmText, item.toggle_url),
+    birthdays: (item, confirmText) => sidebarItem(
+        'birthday-item', `${item.date} - ${item.name}`, item.delete_url, confirmText),
+    marks: (item, confirmText) => sidebarItem(
+        'mark-item', `${item.date} - ${item.text}`, item.delete_url, confirmText),
+};
+
+function renderItem(list, item) {
+    const row = sidebarRenderers[list.dataset.kind](item, list.dataset.confirm);
+    row.dataset.id = item.id;
+    return row;
+}
+
+// Each list pages in through a sentinel placed after it, watched again whenever its next page URL changes.
+const listObserver = new IntersectionObserver(entries => {
+    entries.forEach(async entry => {
+        const list = document.getElementById(entry.target.dataset.sentinel);
+        if (!entry.isIntersecting || list.dataset.loading) {
+            return;
+        }
+        list.dataset.loading = 'true';
+        try {
+            // The rows shown are always the list's first items, so the next page starts
+            // after them however many were added, moved or removed in place since.
+            const url = new URL(list.dataset.moreUrl, location.href);
+            url.searchParams.set('offset', list.querySelectorAll('[data-id]').length);
+            const response = await fetch(url);
+            const page = await response.json();
+            page.items.forEach(item => {
+                // Another tab's change may have shifted an item already shown into this page.
+                if (!list.querySelector(`[data-id="${item.id}"]`)) {
+                    list.appendChild(renderItem(list, item));
+                }
+            });
+            list.dataset.moreUrl = page.next_url || '';
+        } finally {
+            delete list.dataset.loading;
+        }
+        // Re-observing re-checks visibility, so short pages keep loading.
+        watchList(list);
+    });
+});
+
+function watchList(list) {
+    let sentinel = document.querySelector(`[data-sentinel="${list.id}"]`);
+    if (!sentinel) {
+        sentinel = document.createElement('div');
+        sentinel.dataset.sentinel = list.id;
+        list.after(sentinel);
+    }
+    listObserver.unobserve(sentinel);
+    if (list.dataset.moreUrl) {
+        listObserver.observe(sentinel);
+    }
+}
+
+document.querySelectorAll('[data-more-url]').forEach(watchList);
+
+// Year view: each month's grid is fetched once it scrolls into view.
+const monthObserver = new IntersectionObserver(entries => {
+    entries.forEach(async entry => {
+        const container = entry.target;
+        if (!entry.isIntersecting || !container.dataset.gridUrl) {
+            return;
+        }
+        const url = container.dataset.gridUrl;
+        container.dataset.gridUrl = '';
+        monthObserver.unobserve(container);
+        const response = await fetch(url);
+        container.innerHTML = await response.text();
+    });
+});
+
+document.querySelectorAll('[data-grid-url]').forEach(container => {
+    if (container.dataset.gridUrl) {
+        monthObserver.observe(container);
+    }
+});
+
+// Live updates: the server pushes small change messages and only what changed is fetched again.
+const FIRST_PAGE = 20;
+
+async function reloadList(list) {
+    // Keep as many rows as are shown; the server caps the page size.
+    const limit = Math.max(list.querySelectorAll('[data-id]').length, FIRST_PAGE);
+    const response = await fetch(`${list.dataset.url}?limit=${limit}`);
+    const page = await response.json();
+    list.replaceChildren(...page.items.map(item => renderItem(list, item)));
+    if (!page.items.length) {
+        const empty = document.createElement('div');
+        empty.className = 'empty-message';
+        empty.textContent = list.dataset.empty;
+        list.appendChild(empty);
+    }
+    list.dataset.moreUrl = page.next_url || '';
+    watchList(list);
+}
+
+function replaceDays(days) {
+    Object.entries(days).forEach(([date, html]) => {
+        const day = document.querySelector(`#week [data-date="${date}"]`);
+        if (day) {
+            day.outerHTML = html;
+        }
+    });
+}
+
+async function reloadDays(first, count) {
+    const week = document.getElementById('week');
+    const response = await fetch(`${week.dataset.daysUrl}?from=${first}&days=${count}`);
+    replaceDays(await response.json());
+}
+
+function shownDates(change) {
+    // Marks carry DD.MM.YYYY; birthdays DD.MM, and 29.02 shows on 28.02 outside leap years.
+    const prefixes = change.date.length > 5 ? [change.date]
+        : change.date === '29.02' ? ['29.02.', '28.02.'] : [change.date + '.'];
+    return [...document.querySelectorAll('#week [data-date]')]
+        .map(day => day.dataset.date)
+        .filter(date => prefixes.some(prefix => date.startsWith(prefix)));
+}
+
+// Mutations: fetch asks for JSON and only the affected nodes are patched.
+// Without JS the same forms and links redirect back to the page.
+// The client id tells the server which stream not to echo the change to.
+const clientId = Math.random().toString(36).slice(2);
+
+async function mutate(url, options) {
+    const response = await fetch(url, {...options, headers: {Accept: 'application/json', 'X-Client-Id': clientId}});
+    const result = await response.json();
+    if (!response.ok) {
+        alert(result.error);
+        return null;
+    }
+    return result;
+}
+
+function applyMutation(list, result) {
+    if (result.cleared) {
+        clearNotifications();
+    }
+    if (list && result.deleted !== undefined) {
+        list.querySelector(`[data-id="${result.deleted}"]`)?.remove();
+    }
+    if (list && result.item) {
+        list.querySelector(`[data-id="${result.item.id}"]`)?.remove();
+        list.querySelector('.empty-message')?.remove();
+        const rows = list.querySelectorAll('[data-id]');
+        const row = renderItem(list, result.item);
+        if (result.position < rows.length) {
+            rows[result.position].before(row);
+        } else if (!list.dataset.moreUrl) {
+            list.appendChild(row);
+        }
+    }
+    replaceDays(result.days || {});
+}
+
+document.querySelectorAll('form[data-list]').forEach(form => {
+    form.addEventListener('submit', async event => {
+        event.preventDefault();
+        const result = await mutate(form.action, {method: 'POST', body: new FormData(form)});
+        if (result) {
+            applyMutation(document.getElementById(form.dataset.list), result);
+            form.reset();
+        }
+    });
+});
+
+document.addEventListener('click', async event => {
+    const link = event.target.closest('a[data-mutation]');
+    // A declined confirm() has already cancelled the click.
+    if (!link || event.defaultPrevented) {
+        return;
+    }
+    event.preventDefault();
+    const list = link.closest('[data-kind]');
+    const result = await mutate(link.href);
+    if (result) {
+        applyMutation(list, result);
+    }
+});
+
+function clearNotifications() {
+    const card = document.querySelector('#notifications .card');
+    card.querySelectorAll('.notification').forEach(item => item.remove());
+    card.hidden = true;
+}
+
+const week = document.getElementById('week');
+if (week && week.dataset.streamUrl && window.EventSource) {
+    const stream = new EventSource(`${week.dataset.streamUrl}?client=${clientId}`);
+
+    stream.addEventListener('schedule', event => {
+        const change = JSON.parse(event.data);
+        if (change.full || change.weeks.includes(week.dataset.weekStart)) {
+            reloadDays(week.dataset.weekStart, 7);
+        }
+    });
+
+    stream.addEventListener('store', event => {
+        const change = JSON.parse(event.data);
+        if (change.action === 'reload' || change.action === 'batch') {
+            const collections = change.collections || Object.keys(sidebarRenderers);
+            collections.forEach(kind => reloadList(document.querySelector(`[data-kind="${kind}"]`)));
+            if (collections.some(kind => kind !== 'tasks')) {
+                reloadDays(week.dataset.weekStart, 7);
+            }
+            return;
+        }
+        const list = document.querySelector(`[data-kind="${change.collection}"]`);
+        if (change.action === 'delete') {
+            list.querySelector(`[data-id="${change.id}"]`)?.remove();
+        } else {
+            // An add lands anywhere and a toggle moves the task, so the shown rows are fetched in order.
+            reloadList(list);
+        }
+        if (change.date) {
+            shownDates(change).forEach(date => reloadDays(date, 1));
+        }
+    });
+
+    stream.addEventListener('notifications', event => {
+        const change = JSON.parse(event.data);
+        if (change.cleared) {
+            clearNotifications();
+            return;
+        }
+        const card = document.querySelector('#notifications .card');
+        change.added.forEach(notification => {
+            const item = document.createElement('div');
+            item.className = 'notification';
+            item.textContent = notification.message;
+            card.querySelector('.clear-notifications').parentElement.before(item);
+        });
+        card.hidden = false;
+    });
+
+    stream.addEventListener('reload', () => location.reload());
+}
@@ -0,0 +1,299 @@
+from datetime import datetime
+from threading import Lock, RLock
+import json
+import os
+import uuid
+
+from .indexes import TaskIndex, BirthdayIndex, MarkIndex
+
+
+TASKS_FILE = 'tasks.json'
+BIRTHDAYS_FILE = 'birthdays.json'
+MARKS_FILE = 'marks.json'
+SEQUENCES_FILE = 'sequences.json'
+
+def is_valid_date(value):
+    try:
+        datetime.strptime(value, '%d.%m.%Y')
+    except (TypeError, ValueError):
+        return False
+    return True
+
+def is_valid_day(value):
+    return isinstance(value, str) and is_valid_date(value + '.2000')
+
+def is_text(value):
+    return isinstance(value, str) and bool(value)
+
+def load_records(path, field):
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return []
+
+    if isinstance(data, dict):
+        # Files written before records had ids map a date to one value or a list of them.
+        return [
+            {'date': date, field: value}
+            for date, values in data.items()
+            for value in (values if isinstance(values, list) else [values])
+        ]
+    return data
+
+def load_data():
+    tasks = load_records(TASKS_FILE, 'description')
+    birthdays = load_records(BIRTHDAYS_FILE, 'name')
+    marks = load_records(MARKS_FILE, 'text')
+    return tasks, birthdays, marks
+
+def save_data(tasks, birthdays, marks):
+    with open(TASKS_FILE, 'w') as f:
+        json.dump(tasks, f, indent=2)
+    with open(BIRTHDAYS_FILE, 'w') as f:
+        json.dump(birthdays, f, indent=2)
+    with open(MARKS_FILE, 'w') as f:
+        json.dump(marks, f, indent=2)
+
+def load_sequences():
+    try:
+        with open(SEQUENCES_FILE, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+def save_sequences(sequences):
+    with open(SEQUENCES_FILE, 'w') as f:
+        json.dump(sequences, f, indent=2)
+
+class Store:
+    """Data files kept in memory, with the indexes the views read from."""
+
+    def __init__(self):
+        self.lock = RLock()
+        # Versions restart with the process, the token keeps old ETags from matching.
+        self.token = uuid.uuid4().hex[:8]
+        self.version = 0
+        # Changes made inside apply_batch, announced together once it is saved.
+        self.pending = None
+        self.load()
+
+    def load(self):
+        tasks, birthdays, marks = load_data()
+        self.sequences = load_sequences()
+        self.backfilled = False
+        self.tasks = self.index_records('tasks', tasks)
+        self.birthdays = self.index_records('birthdays', birthdays)
+        self.marks = self.index_records('marks', marks)
+
+        self.task_index = TaskIndex(self.tasks.values())
+        self.birthday_index = BirthdayIndex(self.birthdays.values())
+        self.mark_index = MarkIndex(self.marks.values())
+        self.marks_by_date = {}
+        for mark in self.marks.values():
+            self.marks_by_date.setdefault(mark['date'], []).append(mark)
+
+        if self.backfilled:
+            self.save()
+        self.mtimes = file_mtimes()
+        self.touch()
+        self.notify('reload', None, self)
+
+    def index_records(self, name, records):
+        """Map id -> record, giving records without a unique id a new one."""
+        # Ids only ever grow, so a deleted record's id is never handed out again.
+        ids = [record['id'] for record in records if isinstance(record.get('id'), int)]
+        self.sequences[name] = max([self.sequences.get(name, 1)] + [i + 1 for i in ids])
+
+        by_id = {}
+        for record in records:
+            if not isinstance(record.get('id'), int) or record['id'] in by_id:
+                record['id'] = self.next_id(name)
+                self.backfilled = True
+            by_id[record['id']] = record
+        return by_id
+
+    def save(self):
+        with self.lock:
+            save_data(list(self.tasks.values()), list(self.birthdays.values()), list(self.marks.values()))
+            save_sequences(self.sequences)
+            self.mtimes = file_mtimes()
+            self.touch()
+
+    def touch(self):
+        self.version += 1
+
+    def notify(self, action, collection, record):
+        if self.pending is not None:
+            self.pending.append((action, collection, record))
+            return
+        for listener in listeners:
+            listener(action, collection, record)
+
+    def etag(self):
+        return f'{self.token}-{self.version}'
+
+    def next_id(self, name):
+        next_id = self.sequences.get(name, 1)
+        self.sequences[name] = next_id + 1
+        return next_id
+
+    def add_task(self, description, deadline, completed=False):
+        with self.lock:
+            task = {
+                'id': self.next_id('tasks'),
+                'description': description,
+                'deadline': deadline,
+                'completed': completed
+            }
+            self.tasks[task['id']] = task
+            self.task_index.add(task)
+            self.notify('add', 'tasks', task)
+            return task
+
+    def toggle_task(self, task_id):
+        with self.lock:
+            task = self.tasks.get(task_id)
+            if task is not None:
+                key = self.task_index.key(task)
+                task['completed'] = not task.get('completed', False)
+                self.task_index.remove(task, key)
+                self.task_index.add(task)
+                self.notify('update', 'tasks', task)
+            return task
+
+    def delete_task(self, task_id):
+        with self.lock:
+            task = self.tasks.pop(task_id, None)
+            if task is not None:
+                self.task_index.remove(task)
+                self.notify('delete', 'tasks', task)
+            return task
+
+    def add_birthday(self, date, name):
+        with self.lock:
+            birthday = {'id': self.next_id('birthdays'), 'date': date, 'name': name}
+            self.birthdays[birthday['id']] = birthday
+            self.birthday_index.add(birthday)
+            self.notify('add', 'birthdays', birthday)
+            return birthday
+
+    def delete_birthday(self, birthday_id):
+        with self.lock:
+            birthday = self.birthdays.pop(birthday_id, None)
+            if birthday is not None:
+                self.birthday_index.remove(birthday)
+                self.notify('delete', 'birthdays', birthday)
+            return birthday
+
+    def add_mark(self, date, text):
+        with self.lock:
+            mark = {'id': self.next_id('marks'), 'date': date, 'text': text}
+            self.marks[mark['id']] = mark
+            self.mark_index.add(mark)
+            self.marks_by_date.setdefault(date, []).append(mark)
+            self.notify('add', 'marks', mark)
+            return mark
+
+    def delete_mark(self, mark_id):
+        with self.lock:
+            mark = self.marks.pop(mark_id, None)
+            if mark is not None:
+                self.mark_index.remove(mark)
+                day_marks = self.marks_by_date[mark['date']]
+                day_marks.remove(mark)
+                if not day_marks:
+                    del self.marks_by_date[mark['date']]
+                self.notify('delete', 'marks', mark)
+            return mark
+
+    def apply_batch(self, operations):
+        """Apply every operation and save once, or none of them.
+
+        On the first invalid operation the store is reloaded from the
+        untouched data files and ValueError is raised with its position.
+        Any other error rolls back the same way before it propagates.
+        """
+        with self.lock:
+            results = []
+            self.pending = []
+            try:
+                for i, operation in enumerate(operations):
+                    try:
+                        results.append(self.apply_operation(operation))
+                    except (KeyError, TypeError, ValueError) as e:
+                        raise ValueError(f"operation {i}: {e}")
+            except BaseException:
+                # Nothing was announced, and listeners see only the reload.
+                self.pending = None
+                self.load()
+                raise
+            changes, self.pending = self.pending, None
+            self.save()
+            if changes:
+                self.notify('batch', None, changes)
+            return results
+
+    def apply_operation(self, operation):
+        op, collection = operation['op'], operation['collection']
+        if op == 'add':
+            if collection == 'tasks':
+                if not is_text(operation['description']) or not is_valid_date(operation['deadline']):
+                    raise ValueError('invalid task')
+                return self.add_task(operation['description'], operation['deadline'], bool(operation.get('completed')))
+            if collection == 'birthdays':
+                if not is_text(operation['name']) or not is_valid_day(operation['date']):
+                    raise ValueError('invalid birthday')
+                return self.add_birthday(operation['date'], operation['name'])
+            if collection == 'marks':
+                if not is_text(operation['text']) or not is_valid_date(operation['date']):
+                    raise ValueError('invalid mark')
+                return self.add_mark(operation['date'], operation['text'])
+            raise ValueError(f"unsupported operation {op} on {collection}")
+        elif op == 'toggle' and collection == 'tasks':
+            record = self.toggle_task(operation['id'])
+        elif op == 'delete' and collection in ('tasks', 'birthdays', 'marks'):
+            delete = {'tasks': self.delete_task, 'birthdays': self.delete_birthday, 'marks': self.delete_mark}[collection]
+            record = delete(operation['id'])
+        else:
+            raise ValueError(f"unsupported operation {op} on {collection}")
+
+        if record is None:
+            raise ValueError(f"no {collection} record {operation['id']}")
+        return record
+
+def file_mtimes():
+    mtimes = []
+    for path in (TASKS_FILE, BIRTHDAYS_FILE, MARKS_FILE):
+        try:
+            mtimes.append(os.stat(path).st_mtime_ns)
+        except FileNotFoundError:
+            mtimes.append(None)
+    return mtimes
+
+store = None
+store_lock = Lock()
+listeners = []
+
+def subscribe(listener):
+    """Call listener(action, collection, record) after every change to the store.
+
+    action is 'add', 'update' or 'delete'; on a reload it is 'reload',
+    collection is None and record is the reloaded store itself. A saved
+    batch is one 'batch' call whose record is its list of
+    (action, collection, record) changes.
+    """
+    listeners.append(listener)
+
+def get_store():
+    """Shared store, reloaded if a data file was changed outside the app."""
+    global store
+    with store_lock:
+        if store is None:
+            store = Store()
+        elif file_mtimes() != store.mtimes:
+            with store.lock:
+                # The files may only have looked changed because a save() was under way.
+                if file_mtimes() != store.mtimes:
+                    store.load()
+        return store
@@ -0,0 +1,61 @@
+from threading import RLock
+
+from . import schedule, zones
+from .indexes import IntervalIndex
+
+
+lock = RLock()
+snapshot = {}
+
+def timed_events(events):
+    """Start and end epoch arrays of the timed events, with their table positions."""
+    import numpy as np
+
+    positions = np.flatnonzero(~events.all_day & (events.end_ts > events.start_ts))
+    return events.start_ts[positions], events.end_ts[positions], positions
+
+def invalidate(events, changes):
+    with lock:
+        snapshot.clear()
+
+schedule.subscribe(invalidate)
+
+def event_index():
+    """IntervalIndex over the timed events of the current schedule; ids are table positions."""
+    with lock:
+        if 'index' not in snapshot:
+            events = schedule.current_events()
+            snapshot['index'] = IntervalIndex(*timed_events(events))
+            snapshot['events'] = events
+        return snapshot['index'], snapshot['events']
+
+def clashing_positions():
+    """Positions of the timed events that overlap another, and the table they index."""
+    with lock:
+        if 'clashing' not in snapshot:
+            index, events = event_index()
+            snapshot['clashing'] = set(index.clashing().tolist())
+        return snapshot['clashing'], snapshot['events']
+
+def overlapping(start, end):
+    """Timed events overlapping [start, end), by start."""
+    index, events = event_index()
+    return [events[i] for i in index.overlapping(zones.local_epoch(start), zones.local_epoch(end))]
+
+def happening_at(moment):
+    index, events = event_index()
+    return [events[i] for i in index.at(zones.local_epoch(moment))]
+
+def clashes(start, end):
+    """Groups of events that overlap each other, for each chain reaching into [start, end)."""
+    import numpy as np
+
+    with lock:
+        index, events = event_index()
+        if 'groups' not in snapshot:
+            snapshot['groups'] = index.groups()
+        groups = snapshot['groups']
+
+    sizes = np.bincount(groups) if len(groups) else groups
+    hits = groups[index.window(zones.local_epoch(start), zones.local_epoch(end))]
+    return [[events[i] for i in index.ids[groups == group]] for group in np.unique(hits[sizes[hits] > 1])]
@@ -0,0 +1,298 @@
+from flask import render_template, request, redirect, url_for, session, abort, jsonify
+from datetime import datetime, time, timedelta
+from bisect import bisect_right
+
+from . import i18n, live, notifications, overview, schedule, sidebar, timeline, zones
+from .app import app, TEMPLATE_NAME
+from .indexes import BirthdayIndex
+from .storage import get_store
+
+
+def first_page(items, endpoint):
+    chunk, next_offset = sidebar.page(items)
+    more_url = url_for(endpoint, offset=next_offset) if next_offset is not None else ''
+    return {'items': chunk, 'more_url': more_url}
+
+def week_start_date():
+    today = datetime.now().date()
+    return today - timedelta(days=today.weekday()) + timedelta(weeks=session.get('week_offset', 0))
+
+def build_days(store, first, n):
+    """Events, birthdays and marks for each of the n days from first."""
+    day_names = i18n.DAY_NAMES[i18n.get_locale()]
+    events = schedule.load_schedule()
+    # A download can swap the table before the snapshot is invalidated, so positions
+    # are only used with the table they were computed from.
+    clashes, clash_events = timeline.clashing_positions()
+    if clash_events is not events:
+        clashes = set()
+    
+    day_birthdays = {}
+    for day_date, birthday in store.birthday_index.between(first, first + timedelta(days=n - 1)):
+        day_birthdays.setdefault(day_date, []).append(birthday)
+    
+    # Only these days' slice of the start-sorted table is read, then bucketed by day.
+    day_starts = [zones.local_epoch(datetime.combine(first + timedelta(days=i), time())) for i in range(n + 1)]
+    day_events = [[] for i in range(n)]
+    for position in events.between(day_starts[0], day_starts[n]):
+        event = events[position]
+        event.clash = position in clashes
+        day_events[bisect_right(day_starts, event['start_ts']) - 1].append(event)
+    
+    days = []
+    for i in range(n):
+        day_date = first + timedelta(days=i)
+        days.append({
+            'date': day_date,
+            'date_str': day_date.strftime('%d.%m.%Y'),
+            'day_name': day_names[day_date.weekday()],
+            'events': day_events[i],
+            'birthdays': day_birthdays.get(day_date, []),
+            'marks': store.marks_by_date.get(day_date.strftime('%d.%m.%Y'), [])
+        })
+    return days
+
+@app.route('/')
+def index():
+    week_offset = session.get('week_offset', 0)
+    
+    locale = i18n.get_locale()
+    store = get_store()
+    today = datetime.now().date()
+    
+    return render_template(TEMPLATE_NAME, 
+                         tasks=first_page(store.task_index, 'api_tasks'),
+                         week_days=build_days(store, week_start_date(), 7),
+                         today=today.strftime('%d.%m.%Y'),
+                         this_year=today.year,
+                         this_month=today.month,
+                         week_offset=week_offset,
+                         notifications=notifications.localized_notifications(locale),
+                         birthdays=first_page(store.birthday_index.upcoming(today), 'api_birthdays'),
+                         marks=first_page(store.mark_index, 'api_marks'))
+
+def wants_json():
+    """fetch() calls from app.js ask for JSON; plain forms and links get the redirect."""
+    return request.accept_mimetypes.best_match(['text/html', 'application/json']) == 'application/json'
+
+def mutation_response(**result):
+    if wants_json():
+        return jsonify(result)
+    return redirect(url_for('index'))
+
+def error_response(key):
+    message = i18n.messages()[key]
+    if wants_json():
+        return jsonify({'error': message}), 400
+    return message, 400
+
+def render_days(days):
+    """Rendered day blocks by 'DD.MM.YYYY' date."""
+    today = datetime.now().strftime('%d.%m.%Y')
+    return {day['date_str']: render_template('week_day.html', day=day, today=today) for day in days}
+
+def day_fragments(store, dates):
+    """Re-rendered day blocks for those of dates in the session's displayed week."""
+    week_start = week_start_date()
+    dates = sorted({day_date for day_date in dates if 0 <= (day_date - week_start).days < 7})
+    return render_days([day for day_date in dates for day in build_days(store, day_date, 1)])
+
+@app.route('/day_fragments')
+def day_fragments_view():
+    """Re-rendered blocks for up to a week of days from 'from', for live updates.
+
+    The tab asks for the days it shows, which need not be the session's week.
+    """
+    try:
+        first = datetime.strptime(request.args.get('from', ''), '%d.%m.%Y').date()
+    except ValueError:
+        abort(400)
+    n = min(max(request.args.get('days', 7, type=int), 1), 7)
+    return jsonify(render_days(build_days(get_store(), first, n)))
+
+def birthday_dates(birthday):
+    week_start = week_start_date()
+    return [day_date for day_date, item in BirthdayIndex([birthday]).between(week_start, week_start + timedelta(days=6))]
+
+def mark_dates(mark):
+    return [datetime.strptime(mark['date'], '%d.%m.%Y').date()]
+
+def month_view(year, month):
+    if not (1 <= month <= 12 and 1 <= year <= 9999):
+        abort(404)
+    counts = overview.month_counts(year, month)
+    today = datetime.now().date()
+    days = []
+    for i in range(counts['days']):
+        day_date = datetime(year, month, i + 1).date()
+        days.append({
+            'day': i + 1,
+            'date_str': day_date.strftime('%d.%m.%Y'),
+            'is_today': day_date == today,
+            'counts': {kind: counts[kind][i] for kind in overview.KINDS},
+        })
+    return {
+        'year': year,
+        'month': month,
+        'name': i18n.MONTH_NAMES[i18n.get_locale()][month - 1],
+        'weekday': counts['weekday'],
+        'days': days,
+    }
+
+@app.route('/overview/<int:year>')
+def year_overview(year):
+    if not 1 <= year <= 9999:
+        abort(404)
+    locale = i18n.get_locale()
+    # Only the month containing today is rendered; the rest load as they scroll into view.
+    today = datetime.now().date()
+    months = []
+    for month in range(1, 13):
+        months.append({
+            'year': year,
+            'month': month,
+            'name': i18n.MONTH_NAMES[locale][month - 1],
+            'grid': month_view(year, month) if (year, month) == (today.year, today.month) else None,
+        })
+    return render_template('overview.html', year=year, months=months, day_names=i18n.DAY_NAMES[locale])
+
+@app.route('/overview/<int:year>/<int:month>')
+def month_overview(year, month):
+    month_data = month_view(year, month)
+    months = [{**month_data, 'grid': month_data}]
+    return render_template('overview.html', year=year, months=months, day_names=i18n.DAY_NAMES[i18n.get_locale()])
+
+@app.route('/overview/<int:year>/<int:month>/grid')
+def month_grid(year, month):
+    return render_template('month_grid.html', grid=month_view(year, month), day_names=i18n.DAY_NAMES[i18n.get_locale()])
+
+@app.route('/prev_week', methods=['POST'])
+def prev_week():
+    current_offset = session.get('week_offset', 0)
+    session['week_offset'] = current_offset - 1
+    return redirect(url_for('index'))
+
+@app.route('/next_week', methods=['POST'])
+def next_week():
+    current_offset = session.get('week_offset', 0)
+    session['week_offset'] = current_offset + 1
+    return redirect(url_for('index'))
+
+@app.route('/current_week', methods=['POST'])
+def current_week():
+    session['week_offset'] = 0
+    return redirect(url_for('index'))
+
+@app.route('/add_task', methods=['POST'])
+def add_task():
+    description = request.form.get('description')
+    deadline = request.form.get('deadline')
+    
+    if description and deadline:
+        try:
+            datetime.strptime(deadline, '%d.%m.%Y')
+        except ValueError:
+            return error_response('error_date_format')
+        
+        store = get_store()
+        with store.lock:
+            task = store.add_task(description, deadline)
+            store.save()
+            return mutation_response(item=sidebar.task_json(task), position=store.task_index.position(task))
+    
+    return mutation_response()
+
+@app.route('/toggle_task/<int:task_id>')
+def toggle_task(task_id):
+    store = get_store()
+    with store.lock:
+        task = store.toggle_task(task_id)
+        if task is None:
+            return mutation_response()
+        store.save()
+        return mutation_response(item=sidebar.task_json(task), position=store.task_index.position(task))
+
+@app.route('/delete_task/<int:task_id>')
+def delete_task(task_id):
+    store = get_store()
+    with store.lock:
+        if store.delete_task(task_id):
+            store.save()
+    return mutation_response(deleted=task_id)
+
+@app.route('/add_birthday', methods=['POST'])
+def add_birthday():
+    date = request.form.get('date')
+    name = request.form.get('name')
+    
+    if date and name:
+        try:
+            datetime.strptime(date + '.2000', '%d.%m.%Y')
+        except ValueError:
+            return error_response('error_day_format')
+        
+        store = get_store()
+        with store.lock:
+            birthday = store.add_birthday(date, name)
+            store.save()
+            return mutation_response(item=sidebar.birthday_json(birthday),
+                                     position=store.birthday_index.position(birthday, datetime.now().date()),
+                                     days=day_fragments(store, birthday_dates(birthday)))
+    
+    return mutation_response()
+
+@app.route('/delete_birthday/<int:birthday_id>')
+def delete_birthday(birthday_id):
+    store = get_store()
+    with store.lock:
+        birthday = store.delete_birthday(birthday_id)
+        if birthday:
+            store.save()
+            return mutation_response(deleted=birthday_id, days=day_fragments(store, birthday_dates(birthday)))
+    return mutation_response(deleted=birthday_id)
+
+@app.route('/add_mark', methods=['POST'])
+def add_mark():
+    date = request.form.get('date')
+    text = request.form.get('text')
+    
+    if date and text:
+        try:
+            datetime.strptime(date, '%d.%m.%Y')
+        except ValueError:
+            return error_response('error_date_format')
+        
+        store = get_store()
+        with store.lock:
+            mark = store.add_mark(date, text)
+            store.save()
+            return mutation_response(item=sidebar.mark_json(mark), position=len(store.mark_index) - 1,
+                                     days=day_fragments(store, mark_dates(mark)))
+    
+    return mutation_response()
+
+@app.route('/delete_mark/<int:mark_id>')
+def delete_mark(mark_id):
+    store = get_store()
+    with store.lock:
+        mark = store.delete_mark(mark_id)
+        if mark:
+            store.save()
+            return mutation_response(deleted=mark_id, days=day_fragments(store, mark_dates(mark)))
+    return mutation_response(deleted=mark_id)
+
+@app.route('/clear_notifications')
+def clear_notifications():
+    notifications.clear(live.request_client())
+    return mutation_response(cleared=True)
+
+@app.route('/refresh_schedule')
+def refresh_schedule():
+    schedule.invalidate()
+    return redirect(url_for('index'))
+
+@app.route('/set_locale/<locale>')
+def set_locale(locale):
+    if locale in i18n.LOCALES:
+        session['locale'] = locale
+    return redirect(url_for('index'))
@@ -0,0 +1,172 @@
+from datetime import datetime, time
+from functools import lru_cache
+import os
+
+
+MAX_MEMO = 100000
+
+display_tz = None
+display_name = None
+vtimezone_cache = {}
+epoch_memo = {}
+day_offset_memo = {}
+pinned = {}
+
+def configure(name=None):
+    """Show times in the named IANA zone, or in the machine's local zone."""
+    global display_tz, display_name
+    if name:
+        from zoneinfo import ZoneInfo
+        display_tz = ZoneInfo(name)
+    else:
+        from dateutil.tz import tzlocal
+        display_tz = tzlocal()
+    display_name = name or local_zone_name()
+    clear()
+
+def local_zone_name():
+    """Stable name of the machine's zone: its IANA key, or its standard and DST offsets.
+
+    Unlike tzname() it is the same in summer and winter.
+    """
+    name = os.environ.get('TZ', '').lstrip(':') or os.path.realpath('/etc/localtime')
+    name = name.partition('/zoneinfo/')[2] or name
+    from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+    try:
+        return ZoneInfo(name).key
+    except (ZoneInfoNotFoundError, ValueError):
+        pass
+    from time import timezone, altzone
+    return f'local {offset_text(-timezone)}/{offset_text(-altzone)}'
+
+def offset_text(seconds):
+    sign = '-' if seconds < 0 else '+'
+    hours, minutes = divmod(abs(seconds) // 60, 60)
+    return f'{sign}{hours:02d}:{minutes:02d}'
+
+def clear():
+    epoch_memo.clear()
+    day_offset_memo.clear()
+    display_text.cache_clear()
+    local_ordinal.cache_clear()
+
+def display_zone():
+    if display_tz is None:
+        configure()
+    return display_tz
+
+def zone_name():
+    """Name of the display zone, which snapshots are checked against."""
+    display_zone()
+    return display_name
+
+def vtimezones(calendar):
+    """TZID -> tzinfo for the VTIMEZONEs of a feed.
+
+    Zones are cached by their iCalendar text, so an unchanged VTIMEZONE keeps
+    the same tzinfo across downloads, and with it every memoised conversion.
+    """
+    zones = {}
+    for component in calendar.walk('VTIMEZONE'):
+        key = component.to_ical()
+        if key not in vtimezone_cache:
+            vtimezone_cache[key] = component.to_tz()
+        zones[str(component['TZID'])] = vtimezone_cache[key]
+    return zones
+
+def with_cached_zone(value, tzid, zones):
+    """value with its zone taken from the cached VTIMEZONEs when there is one."""
+    if isinstance(value, datetime) and value.tzinfo is not None and tzid in zones:
+        return value.replace(tzinfo=zones[tzid])
+    return value
+
+def component_time(component, name, zones):
+    """DTSTART/DTEND/RECURRENCE-ID value of a component."""
+    prop = component.get(name)
+    return with_cached_zone(prop.dt, prop.params.get('TZID'), zones)
+
+def component_times(component, name, zones):
+    """Epoch seconds of every value of a multi-valued property such as EXDATE or RDATE."""
+    props = component.get(name)
+    if props is None:
+        return []
+    if not isinstance(props, list):
+        props = [props]
+    times = []
+    for prop in props:
+        tzid = prop.params.get('TZID')
+        for value in prop.dts:
+            value = value.dt
+            if isinstance(value, tuple):
+                # An RDATE PERIOD: only its start matters here.
+                value = value[0]
+            times.append(epoch(with_cached_zone(value, tzid, zones)))
+    return times
+
+def zone_of(value):
+    """The zone a value's wall-clock time is in: its own, or the display zone if floating."""
+    return getattr(value, 'tzinfo', None) or display_zone()
+
+def wall_epoch(wall, tz):
+    """Epoch seconds of a naive wall-clock datetime in tz, memoised."""
+    key = (id(tz), wall)
+    epoch = epoch_memo.get(key)
+    if epoch is None:
+        if len(epoch_memo) > MAX_MEMO:
+            epoch_memo.clear()
+        pinned[id(tz)] = tz
+        epoch = epoch_memo[key] = int(wall.replace(tzinfo=tz).timestamp())
+    return epoch
+
+def epoch(value):
+    """Epoch seconds of an aware, floating or date-only iCalendar value."""
+    if not isinstance(value, datetime):
+        return wall_epoch(datetime.combine(value, time()), display_zone())
+    return wall_epoch(value.replace(tzinfo=None), zone_of(value))
+
+def local_epoch(value):
+    """Epoch seconds of a naive datetime in the display zone, such as a query bound."""
+    return wall_epoch(value, display_zone())
+
+def wall_time(seconds, tz):
+    return datetime.fromtimestamp(seconds, tz).replace(tzinfo=None)
+
+def day_offset(day, tz):
+    """UTC offset in seconds shared by the whole day, or None on a transition day."""
+    key = (id(tz), day)
+    if key not in day_offset_memo:
+        if len(day_offset_memo) > MAX_MEMO:
+            day_offset_memo.clear()
+        pinned[id(tz)] = tz
+        first = datetime.combine(day, time()).replace(tzinfo=tz).utcoffset()
+        last = datetime.combine(day, time(23, 59, 59)).replace(tzinfo=tz).utcoffset()
+        day_offset_memo[key] = int(first.total_seconds()) if first == last else None
+    return day_offset_memo[key]
+
+def wall_epochs(walls, tz):
+    """Epoch seconds for a datetime64[s] array of wall-clock times in tz.
+
+    The offset is looked up once per distinct day; only occurrences on a DST
+    transition day are converted one by one.
+    """
+    import numpy as np
+
+    seconds = walls.astype('datetime64[s]').astype(np.int64)
+    days, inverse = np.unique(walls.astype('datetime64[D]'), return_inverse=True)
+    offsets = [day_offset(day, tz) for day in days.tolist()]
+    epochs = seconds - np.array([offset or 0 for offset in offsets], dtype=np.int64)[inverse]
+    for i, offset in enumerate(offsets):
+        if offset is None:
+            for j in np.flatnonzero(inverse == i):
+                epochs[j] = wall_epoch(walls[j].astype('datetime64[s]').item(), tz)
+    return epochs
+
+@lru_cache(maxsize=4096)
+def display_text(seconds, all_day=False):
+    """'DD.MM.YYYY HH:MM' (or 'DD.MM.YYYY' for all-day) in the display zone."""
+    return wall_time(seconds, display_zone()).strftime('%d.%m.%Y' if all_day else '%d.%m.%Y %H:%M')
+
+@lru_cache(maxsize=4096)
+def local_ordinal(seconds):
+    """Proleptic ordinal of the display-zone day containing an epoch time."""
+    return wall_time(seconds, display_zone()).toordinal()
@@ -0,0 +1,75 @@
+from datetime import date, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+import random
+
+import pytest
+from dateutil import rrule
+
+from calendar_app import recurrence, zones
+
+
+BERLIN = ZoneInfo('Europe/Berlin')
+DAYS = list(recurrence.WEEKDAYS)
+# 02:30 does not exist on the spring-forward Sunday and happens twice in autumn.
+TIMES = [(0, 0), (2, 30), (9, 0), (23, 45)]
+
+@pytest.fixture(autouse=True)
+def berlin():
+    zones.configure('Europe/Berlin')
+    yield
+    zones.display_tz = None
+    zones.clear()
+
+def reference(rule_text, dtstart, after, before):
+    """What dateutil itself expands the rule to, as epoch seconds."""
+    rule = rrule.rrulestr(rule_text, dtstart=dtstart)
+    if getattr(dtstart, 'tzinfo', None) is not None:
+        after = datetime.fromtimestamp(zones.local_epoch(after), timezone.utc)
+        before = datetime.fromtimestamp(zones.local_epoch(before), timezone.utc)
+    return [zones.epoch(occ) for occ in rule.between(after, before)]
+
+def random_case(rng):
+    # Starts near the DST switches of 2024 and 2025, so windows cross them.
+    start = date(2024, rng.choice([3, 10]), 1) + timedelta(days=rng.randrange(400))
+    kind = rng.choice(['aware', 'floating', 'all-day'])
+    hour, minute = rng.choice(TIMES)
+    if kind == 'all-day':
+        dtstart = start
+    else:
+        dtstart = datetime(start.year, start.month, start.day, hour, minute)
+        if kind == 'aware':
+            dtstart = dtstart.replace(tzinfo=BERLIN)
+
+    parts = ['FREQ=WEEKLY']
+    if rng.random() < 0.5:
+        parts.append(f'INTERVAL={rng.randint(1, 4)}')
+    if rng.random() < 0.6:
+        parts.append('BYDAY=' + ','.join(rng.sample(DAYS, rng.randint(1, 4))))
+    if rng.random() < 0.5:
+        until = datetime.combine(start, datetime.min.time()) + timedelta(days=rng.randrange(300),
+                                                                         hours=rng.randrange(24))
+        if kind == 'aware':
+            # RFC 5545 wants a UTC UNTIL when DTSTART has a zone.
+            parts.append(until.strftime('UNTIL=%Y%m%dT%H%M%SZ'))
+        elif kind == 'all-day':
+            parts.append(until.strftime('UNTIL=%Y%m%d'))
+        else:
+            parts.append(until.strftime('UNTIL=%Y%m%dT%H%M%S'))
+    rng.shuffle(parts)
+
+    after = datetime.combine(start, datetime.min.time()) + timedelta(days=rng.randrange(-30, 200),
+                                                                     minutes=rng.choice([0, 30, 150, 600]))
+    before = after + timedelta(days=rng.randrange(1, 120))
+    return ';'.join(parts), dtstart, after, before
+
+@pytest.mark.parametrize('seed', range(300))
+def test_expand_matches_dateutil(seed):
+    rule_text, dtstart, after, before = random_case(random.Random(seed))
+    assert recurrence.expand(rule_text, dtstart, after, before) == reference(rule_text, dtstart, after, before)
+
+def test_weekly_lecture_keeps_its_wall_clock_across_dst():
+    dtstart = datetime(2025, 3, 20, 9, 0, tzinfo=BERLIN)
+    starts = recurrence.expand('FREQ=WEEKLY;BYDAY=TH', dtstart, datetime(2025, 3, 19), datetime(2025, 4, 4))
+    assert [zones.wall_time(start, BERLIN).hour for start in starts] == [9, 9, 9]
+    # The clocks go forward on 30 March, so that week is an hour short.
+    assert starts[2] - starts[1] == 7 * 86400 - 3600
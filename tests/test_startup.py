@@ -0,0 +1,39 @@
+import subprocess
+import sys
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Whole import, Flask included, and the part of it that is the app's own code.
+STARTUP_BUDGET_MS = 250
+OWN_BUDGET_MS = 50
+
+# Only needed once the schedule is downloaded or an index is built.
+DEFERRED_MODULES = ('requests', 'icalendar', 'dateutil.rrule', 'numpy')
+
+def import_app():
+    """Cumulative -X importtime microseconds per module, and the modules left loaded."""
+    code = f'import sys, calendar_app; print(",".join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))'
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            self_us, cumulative_us, name = line[len('import time:'):].split('|')
+            if cumulative_us.strip().isdigit():
+                cumulative[name.strip()] = int(cumulative_us)
+    loaded = [name for name in result.stdout.strip().split(',') if name]
+    return cumulative, loaded
+
+def test_import_defers_heavy_modules():
+    cumulative, loaded = import_app()
+    assert loaded == []
+
+def test_import_within_budget():
+    # Best of three, so one slow run on a busy machine does not fail the build.
+    runs = [import_app()[0] for i in range(3)]
+    total = min(run['calendar_app'] for run in runs) / 1000
+    own = min(run['calendar_app'] - run.get('flask', 0) for run in runs) / 1000
+    assert total < STARTUP_BUDGET_MS, f'import calendar_app took {total:.0f} ms'
+    assert own < OWN_BUDGET_MS, f'calendar_app itself took {own:.0f} ms on top of Flask'
@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+from calendar_app import storage
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    # Data files are relative to the working directory.
+    monkeypatch.chdir(tmp_path)
+    changes = []
+    monkeypatch.setattr(storage, 'listeners', [lambda *change: changes.append(change)])
+    store = storage.Store()
+    store.changes = changes
+    store.add_task('kept', '01.01.2030')
+    store.save()
+    changes.clear()
+    return store
+
+def saved_tasks():
+    with open(storage.TASKS_FILE) as f:
+        return [task['description'] for task in json.load(f)]
+
+@pytest.mark.parametrize('bad', [
+    {'op': 'add', 'collection': 'notes', 'text': 'x'},
+    {'op': 'add', 'collection': 'tasks', 'description': 5, 'deadline': '01.01.2030'},
+    {'op': 'add', 'collection': 'marks', 'date': '01.01.2030', 'text': ''},
+    {'op': 'delete', 'collection': 'tasks', 'id': 999},
+    {'op': 'toggle', 'collection': 'tasks'},
+])
+def test_failed_batch_rolls_back(store, bad):
+    operations = [{'op': 'add', 'collection': 'tasks', 'description': 'new', 'deadline': '02.01.2030'},
+                  {'op': 'toggle', 'collection': 'tasks', 'id': 1}, bad]
+    with pytest.raises(ValueError, match='operation 2'):
+        store.apply_batch(operations)
+
+    assert [task['description'] for task in store.task_index] == ['kept']
+    assert not store.tasks[1]['completed']
+    assert saved_tasks() == ['kept']
+    # Only the reload was announced, and later changes are heard again.
+    assert [change[0] for change in store.changes] == ['reload']
+    store.add_mark('01.01.2030', 'after')
+    assert store.changes[-1][0] == 'add'
+
+def test_batch_is_saved_and_announced_once(store):
+    results = store.apply_batch([
+        {'op': 'add', 'collection': 'tasks', 'description': 'new', 'deadline': '02.01.2030'},
+        {'op': 'add', 'collection': 'birthdays', 'date': '29.02', 'name': 'leap'},
+        {'op': 'delete', 'collection': 'tasks', 'id': 1},
+    ])
+
+    assert [record['id'] for record in results] == [2, 1, 1]
+    assert saved_tasks() == ['new']
+    assert len(store.changes) == 1
+    action, collection, changes = store.changes[0]
+    assert action == 'batch'
+    assert [(change[0], change[1]) for change in changes] == [('add', 'tasks'), ('add', 'birthdays'), ('delete', 'tasks')]